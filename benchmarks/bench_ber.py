@@ -0,0 +1,33 @@
+"""Benchmark: Monte Carlo BER throughput (bits/s) per scheme and worker count.
+
+Run from the repository root:
+    python benchmarks/bench_ber.py --bits 2000000 --workers 1 4
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from modulation import MOD_TYPES, ber_sweep  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bits", type=int, default=2_000_000, help="bits per SNR point")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1])
+    args = parser.parse_args()
+
+    ebn0_db = [0.0, 4.0, 8.0]
+    print(f"{len(ebn0_db)} Eb/N0 points x {args.bits:,} bits")
+    print(f"{'scheme':<6} {'workers':>7} {'time (s)':>9} {'Mbit/s':>8} {'Mbit/s/worker':>14}")
+    for mod_type in MOD_TYPES:
+        for workers in args.workers:
+            res = ber_sweep(mod_type, ebn0_db, args.bits, workers=workers)
+            rate = res["bits_per_sec"] / 1e6
+            print(f"{mod_type:<6} {workers:>7} {res['elapsed']:>9.3f} {rate:>8.2f} {rate / workers:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Benchmark: per-bit boolean-mask loop vs. vectorized symbol-index engine.
+
+Covers the five schemes of the original loop (`COMPARE_TYPES`).
+
+The vectorized engine is timed with direct carrier evaluation and with the
+per-symbol carrier lookup table (used when fc * Tb is an integer).
+
+Run from the repository root:
+    python benchmarks/bench_modulation.py --bits 500 --fs 1000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from numpy import pi
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from modulation import COMPARE_TYPES, modulate  # noqa: E402
+
+
+def loop_modulate(mod_type, bits, bit_rate, A, fc, fs, f_delta=None):
+    """The original per-bit mask loop from page_visualizer, kept for reference."""
+    bits = ["1" if b else "0" for b in bits]
+    Tb = 1 / bit_rate
+    T = Tb * len(bits)
+    t = np.linspace(0, T, int(fs * len(bits)))
+    signal = np.zeros_like(t)
+
+    if mod_type == "ASK":
+        for i, b in enumerate(bits):
+            idx = (t >= i * Tb) & (t < (i + 1) * Tb)
+            carrier = np.sin(2 * pi * fc * t[idx])
+            signal[idx] = A * carrier if b == "1" else 0
+
+    elif mod_type == "BPSK":
+        for i, b in enumerate(bits):
+            idx = (t >= i * Tb) & (t < (i + 1) * Tb)
+            phase = 0 if b == "0" else pi
+            signal[idx] = A * np.sin(2 * pi * fc * t[idx] + phase)
+
+    elif mod_type == "QPSK":
+        if len(bits) % 2 != 0:
+            bits.append("0")
+        mapping = {"00": pi / 4, "01": 3 * pi / 4, "11": 5 * pi / 4, "10": 7 * pi / 4}
+        for i in range(0, len(bits), 2):
+            idx = (t >= (i / 2) * Tb) & (t < ((i / 2) + 1) * Tb)
+            phase = mapping["".join(bits[i:i + 2])]
+            signal[idx] = A * np.sin(2 * pi * fc * t[idx] + phase)
+
+    elif mod_type == "FSK":
+        f1, f2 = fc - f_delta / 2, fc + f_delta / 2
+        for i, b in enumerate(bits):
+            idx = (t >= i * Tb) & (t < (i + 1) * Tb)
+            signal[idx] = A * np.sin(2 * pi * (f1 if b == "0" else f2) * t[idx])
+
+    elif mod_type == "DPSK":
+        prev_phase = 0
+        for i, b in enumerate(bits):
+            idx = (t >= i * Tb) & (t < (i + 1) * Tb)
+            if b == "1":
+                prev_phase = (prev_phase + pi) % (2 * pi)
+            signal[idx] = A * np.sin(2 * pi * fc * t[idx] + prev_phase)
+
+    return t, signal
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bits", type=int, default=500)
+    parser.add_argument("--fs", type=int, default=1000, help="samples per bit")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    bits = rng.integers(0, 2, args.bits, dtype=np.uint8)
+    params = dict(bit_rate=5, A=3.0, fc=10.0, fs=args.fs, f_delta=10.0)
+
+    print(f"{args.bits} bits x {args.fs} samples/bit = {args.bits * args.fs:,} samples")
+    print(f"{'scheme':<6} {'loop (s)':>10} {'direct (s)':>11} {'table (s)':>10} {'speedup':>9}")
+    for mod_type in COMPARE_TYPES:  # the schemes `loop_modulate` implements
+        t_loop = best_of(lambda: loop_modulate(mod_type, bits, **params), args.repeat)
+        t_vec = best_of(lambda: modulate(mod_type, bits, table=False, **params), args.repeat)
+        t_tab = best_of(lambda: modulate(mod_type, bits, table=True, **params), args.repeat)
+        print(f"{mod_type:<6} {t_loop:>10.4f} {t_vec:>11.4f} {t_tab:>10.4f} {t_loop / min(t_vec, t_tab):>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+"""Memoized signal generation for the Streamlit UI.
+
+Each pipeline stage is wrapped in `st.cache_data` with a bounded number of
+entries. The modulation stage is keyed on the waveform parameters only, so
+changing the SNR or the seed reuses the clean signal; the channel and
+demodulation stages are keyed on the full parameter tuple including the RNG
+seed, so zooming the waveform does not demodulate again.
+
+Hit/miss counts are process-wide (shared by every session), since they live
+in this imported module rather than in the rerun script.
+
+The expensive results are also kept in an on-disk `DiskCache`, keyed by a
+hash of their parameters and seed, so they survive restarts and are shared
+by every session: the simulated waveforms, BER runs and parameter-sweep
+cells (a grown grid only simulates its new cells). Waveforms come back as
+read-only memory maps, which is why their stages use `st.cache_resource`:
+sharing the maps needs no copy, so a repeat view costs almost nothing
+whatever the signal length.
+"""
+
+import threading
+from pathlib import Path
+
+import numpy as np
+import streamlit as st
+
+from modulation import (
+    COMPARE_TYPES,
+    DiskCache,
+    awgn,
+    awgn_all,
+    baseband_awgn,
+    baseband_demodulate,
+    baseband_modulate,
+    baseband_sps,
+    baseband_symbol_points,
+    ber_params,
+    ber_sweep,
+    compare_summary,
+    demodulate,
+    ebn0_from_snr,
+    envelope_to_passband,
+    eye_density,
+    eye_windows,
+    iq_density,
+    load_bits,
+    matched_filter_output,
+    max_pool,
+    mix_down,
+    modulate,
+    modulate_all,
+    parameter_sweep,
+    spectrogram,
+    subsample,
+    symbol_bits,
+    symbol_points,
+    welch_psd,
+)
+
+CACHE_MAX_ENTRIES = 32
+# Results worth keeping across restarts and sessions are stored on disk, least
+# recently used files evicted beyond DISK_CACHE_BYTES
+DISK_CACHE_DIR = Path(__file__).parent / ".sim_cache"
+DISK_CACHE_BYTES = 2 << 30
+BER_FIELDS = ("ebn0_db", "errors", "bits", "ber", "ci_low", "ci_high", "theory", "elapsed",
+              "bits_per_sec")
+
+
+class CacheStats:
+    """Thread-safe call/miss counters per cached stage."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._misses = {}
+
+    def call(self, stage):
+        with self._lock:
+            self._calls[stage] = self._calls.get(stage, 0) + 1
+
+    def miss(self, stage):
+        with self._lock:
+            self._misses[stage] = self._misses.get(stage, 0) + 1
+
+    def snapshot(self):
+        """Return `{stage: (hits, misses)}`."""
+        with self._lock:
+            return {
+                stage: (calls - self._misses.get(stage, 0), self._misses.get(stage, 0))
+                for stage, calls in self._calls.items()
+            }
+
+
+stats = CacheStats()
+disk_cache = DiskCache(DISK_CACHE_DIR, DISK_CACHE_BYTES)
+
+
+# The cached bodies only execute on a miss, so that is where misses are counted.
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def _cached_modulate(mod_type, bits, bit_rate, A, fc, fs, f_delta, pulse=None):
+    stats.miss("modulate")
+    return disk_cache.memoize(
+        lambda: modulate(mod_type, bits, bit_rate, A, fc, fs, f_delta, pulse=pulse), ("t", "signal"),
+        stage="modulate", mod_type=mod_type, bits=bits, bit_rate=bit_rate, A=A, fc=fc, fs=fs,
+        f_delta=f_delta, pulse=pulse)
+
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def _cached_channel(mod_type, bits, bit_rate, A, fc, fs, snr_db, f_delta, seed, pulse=None):
+    stats.miss("channel")
+
+    def compute():
+        # Bypasses the counter: `simulate` already counted this modulate call
+        _, signal = _cached_modulate(mod_type, bits, bit_rate, A, fc, fs, f_delta, pulse)
+        return (awgn(signal, snr_db, seed),)
+
+    rx, = disk_cache.memoize(compute, ("rx",), stage="channel", mod_type=mod_type, bits=bits,
+                             bit_rate=bit_rate, A=A, fc=fc, fs=fs, snr_db=snr_db, f_delta=f_delta,
+                             seed=seed, pulse=pulse)
+    return rx
+
+
+def cached_modulate(mod_type, bits, bit_rate, A, fc, fs, f_delta, pulse=None):
+    """Memoized `modulate`. Returns `(t, signal)`."""
+    stats.call("modulate")
+    return _cached_modulate(mod_type, bits, bit_rate, A, fc, fs, f_delta, pulse)
+
+
+def simulate(mod_type, bits, bit_rate, A, fc, fs, snr_db, f_delta, seed, pulse=None):
+    """Memoized modulation + AWGN. Returns `(t, signal, rx)`."""
+    t, signal = cached_modulate(mod_type, bits, bit_rate, A, fc, fs, f_delta, pulse)
+    stats.call("channel")
+    rx = _cached_channel(mod_type, bits, bit_rate, A, fc, fs, snr_db, f_delta, seed, pulse)
+    return t, signal, rx
+
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def _cached_baseband(mod_type, bits, bit_rate, A, fs, snr_db, f_delta, seed, pulse=None):
+    stats.miss("baseband")
+
+    def compute():
+        sps = baseband_sps(mod_type, bit_rate, f_delta)
+        t, x = baseband_modulate(mod_type, bits, bit_rate, A, sps, f_delta, pulse=pulse)
+        return t, x, baseband_awgn(x, ebn0_from_snr(snr_db, fs), sps, seed)
+
+    return disk_cache.memoize(compute, ("t", "x", "r"), stage="baseband", mod_type=mod_type,
+                              bits=bits, bit_rate=bit_rate, A=A, fs=fs, snr_db=snr_db,
+                              f_delta=f_delta, seed=seed, pulse=pulse)
+
+
+def simulate_baseband(mod_type, bits, bit_rate, A, fs, snr_db, f_delta, seed, pulse=None):
+    """Memoized complex-baseband modulation + AWGN. Returns `(t, x, r)`.
+
+    The noise level matches the passband `simulate` at `fs` samples per bit
+    and the same per-sample `snr_db`.
+    """
+    stats.call("baseband")
+    return _cached_baseband(mod_type, bits, bit_rate, A, fs, snr_db, f_delta, seed, pulse)
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def _cached_recover(domain, mod_type, bits, bit_rate, A, fc, fs, snr_db, f_delta, seed, pulse=None):
+    stats.miss("demodulate")
+    if domain == "passband":
+        t, _, rx = simulate(mod_type, bits, bit_rate, A, fc, fs, snr_db, f_delta, seed, pulse)
+        decided = demodulate(mod_type, rx, t, A, fc, fs, f_delta, pulse)
+    else:
+        t, _, r = simulate_baseband(mod_type, bits, bit_rate, A, fs, snr_db, f_delta, seed, pulse)
+        sps = baseband_sps(mod_type, bit_rate, f_delta)
+        decided = baseband_demodulate(mod_type, r, t, A, sps, f_delta, pulse)
+    return decided[:len(bits)]
+
+
+def recover_bits(domain, mod_type, bits, bit_rate, A, fc, fs, snr_db, f_delta, seed, pulse=None):
+    """Memoized demodulation of the simulated received signal. Returns the decided bits."""
+    stats.call("demodulate")
+    return _cached_recover(domain, mod_type, bits, bit_rate, A, fc, fs, snr_db, f_delta, seed, pulse)
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def _cached_psd(domain, mod_type, bits, bit_rate, A, fc, fs, snr_db, f_delta, seed, pulse,
+                nperseg, window):
+    stats.miss("spectrum")
+    if domain == "passband":
+        _, signal, rx = simulate(mod_type, bits, bit_rate, A, fc, fs, snr_db, f_delta, seed, pulse)
+        f, p_tx = welch_psd(signal, bit_rate * fs, nperseg, window=window)
+        _, p_rx = welch_psd(rx, bit_rate * fs, nperseg, window=window)
+        return f, p_tx, p_rx
+    _, x, r = simulate_baseband(mod_type, bits, bit_rate, A, fs, snr_db, f_delta, seed, pulse)
+    # Same frequency resolution as the passband estimate at fs samples per bit
+    sps = baseband_sps(mod_type, bit_rate, f_delta)
+    nperseg = max(16, round(nperseg * sps / fs))
+    f, p_tx = envelope_to_passband(*welch_psd(x, bit_rate * sps, nperseg, window=window), fc)
+    _, p_rx = envelope_to_passband(*welch_psd(r, bit_rate * sps, nperseg, window=window), fc)
+    return f, p_tx, p_rx
+
+
+def cached_psd(domain, mod_type, bits, bit_rate, A, fc, fs, snr_db, f_delta, seed, pulse=None,
+               nperseg=4096, window="hann"):
+    """Memoized Welch PSD of the simulated signal and rx. Returns `(f, psd_tx, psd_rx)`.
+
+    Baseband envelopes are converted to the equivalent one-sided passband PSD.
+    """
+    stats.call("spectrum")
+    return _cached_psd(domain, mod_type, bits, bit_rate, A, fc, fs, snr_db, f_delta, seed, pulse,
+                       nperseg, window)
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def _cached_spectrogram(domain, mod_type, bits, bit_rate, A, fc, fs, snr_db, f_delta, seed, pulse,
+                        frame_bits, window, f_lo, f_hi, max_frames, max_bins):
+    stats.miss("spectrogram")
+    if domain == "passband":
+        _, _, rx = simulate(mod_type, bits, bit_rate, A, fc, fs, snr_db, f_delta, seed, pulse)
+        t, f, rows = spectrogram(rx, bit_rate * fs, max(8, round(frame_bits * fs)), window=window)
+    else:
+        _, _, r = simulate_baseband(mod_type, bits, bit_rate, A, fs, snr_db, f_delta, seed, pulse)
+        sps = baseband_sps(mod_type, bit_rate, f_delta)
+        t, f, rows = spectrogram(r, bit_rate * sps, max(8, round(frame_bits * sps)), window=window)
+        f, rows = envelope_to_passband(f, rows, fc)
+    band = (f >= f_lo) & (f <= f_hi)
+    return max_pool(t, f[band], rows[:, band].T, max_frames, max_bins)
+
+
+def cached_spectrogram(domain, mod_type, bits, bit_rate, A, fc, fs, snr_db, f_delta, seed,
+                       pulse=None, frame_bits=1.0, window="hann", f_lo=0.0, f_hi=float("inf"),
+                       max_frames=600, max_bins=300):
+    """Memoized spectrogram of rx over `[f_lo, f_hi]` Hz, frames of `frame_bits` bit periods.
+
+    Returns `(t, f, power)` with `power[f, t]` in units^2/Hz, max-pooled to at
+    most `max_bins` by `max_frames` cells for display.
+    """
+    stats.call("spectrogram")
+    return _cached_spectrogram(domain, mod_type, bits, bit_rate, A, fc, fs, snr_db, f_delta, seed,
+                               pulse, frame_bits, window, f_lo, f_hi, max_frames, max_bins)
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def _cached_constellation(domain, mod_type, bits, bit_rate, A, fc, fs, snr_db, f_delta, seed, pulse,
+                          bins):
+    stats.miss("constellation")
+    if domain == "passband":
+        t, _, rx = simulate(mod_type, bits, bit_rate, A, fc, fs, snr_db, f_delta, seed, pulse)
+        z = symbol_points(mod_type, rx, t, A, fc, fs, pulse)
+    else:
+        _, _, r = simulate_baseband(mod_type, bits, bit_rate, A, fs, snr_db, f_delta, seed, pulse)
+        z = baseband_symbol_points(mod_type, r, A, baseband_sps(mod_type, bit_rate, f_delta), pulse)
+    return iq_density(z, bins), subsample(z, seed=seed), len(z)
+
+
+def cached_constellation(domain, mod_type, bits, bit_rate, A, fc, fs, snr_db, f_delta, seed,
+                         pulse=None, bins=128):
+    """Memoized constellation of the received symbols (linear schemes only).
+
+    Returns `((i, q, counts), sample, n_symbols)`: the `iq_density` histogram
+    of every matched-filter output and a random subsample of the points.
+    """
+    stats.call("constellation")
+    return _cached_constellation(domain, mod_type, bits, bit_rate, A, fc, fs, snr_db, f_delta, seed,
+                                 pulse, bins)
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def _cached_eye(domain, mod_type, bits, bit_rate, A, fc, fs, snr_db, f_delta, seed, pulse,
+                component, bins):
+    stats.miss("eye")
+    if domain == "passband":
+        t, _, rx = simulate(mod_type, bits, bit_rate, A, fc, fs, snr_db, f_delta, seed, pulse)
+        r, sps = mix_down(rx, t, fc), int(fs)
+    else:
+        _, _, r = simulate_baseband(mod_type, bits, bit_rate, A, fs, snr_db, f_delta, seed, pulse)
+        sps = baseband_sps(mod_type, bit_rate, f_delta)
+    sym_len = symbol_bits(mod_type) * sps
+    y = matched_filter_output(r, sym_len, pulse) / A
+    windows = eye_windows(y.real if component == "I" else y.imag, sym_len)
+    return eye_density(windows, bins), len(windows)
+
+
+def cached_eye(domain, mod_type, bits, bit_rate, A, fc, fs, snr_db, f_delta, seed,
+               pulse=None, component="I", bins=128):
+    """Memoized eye diagram of the received envelope (linear schemes only).
+
+    The matched-filter output's I or Q `component` is cut into two-symbol
+    windows and binned by `eye_density`. Returns `((t, y, counts), n_windows)`.
+    """
+    stats.call("eye")
+    return _cached_eye(domain, mod_type, bits, bit_rate, A, fc, fs, snr_db, f_delta, seed,
+                       pulse, component, bins)
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def _cached_compare(bits, bit_rate, A, fc, fs, snr_db, f_delta, seed):
+    stats.miss("compare")
+    t, signals = modulate_all(bits, bit_rate, A, fc, fs, f_delta)
+    rx = awgn_all(signals, snr_db, seed)
+    summary = compare_summary(COMPARE_TYPES, bits, t, signals, rx, bit_rate, A, fc, fs, snr_db, f_delta)
+    return t, signals, rx, summary
+
+
+def cached_compare(bits, bit_rate, A, fc, fs, snr_db, f_delta, seed):
+    """Memoized passband simulation of every `COMPARE_TYPES` scheme on the same bits and noise.
+
+    Returns `(t, signals, rx, summary)` with one row per scheme and the
+    `compare_summary` table.
+    """
+    stats.call("compare")
+    return _cached_compare(bits, bit_rate, A, fc, fs, snr_db, f_delta, seed)
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def cached_load_bits(data, fmt):
+    """Memoized `load_bits` for uploaded payloads."""
+    return load_bits(data, fmt)
+
+
+# Not wrapped in `st.cache_data`: `_progress` drives an element outside the function,
+# which Streamlit cannot replay on a cache hit. The disk cache memoizes it instead.
+def cached_ber_sweep(mod_type, ebn0_db, n_bits, seed, workers, target_errors=None,
+                     rel_ci_width=None, domain="passband", pulse=None, _progress=None):
+    """`ber_sweep` memoized in `disk_cache`, keyed without `workers` (which does not change it)
+    but with the scheme's full simulation parameters (`ber_params`).
+
+    `_progress` is only called when the run is simulated; a run loaded from
+    disk reports its original time.
+    """
+    def compute():
+        res = ber_sweep(mod_type, ebn0_db, n_bits, seed=seed, workers=workers,
+                        params=dict(pulse=pulse), target_errors=target_errors,
+                        rel_ci_width=rel_ci_width, progress=_progress, domain=domain)
+        return tuple(res[name] for name in BER_FIELDS)
+
+    arrays = disk_cache.memoize(compute, BER_FIELDS, stage="ber", mod_type=mod_type, ebn0_db=ebn0_db,
+                                n_bits=n_bits, seed=seed, target_errors=target_errors,
+                                rel_ci_width=rel_ci_width, domain=domain,
+                                params=ber_params(mod_type, dict(pulse=pulse)))
+    res = {name: np.array(a) for name, a in zip(BER_FIELDS, arrays)}
+    res["elapsed"], res["bits_per_sec"] = float(res["elapsed"]), float(res["bits_per_sec"])
+    return res
+
+
+def cached_parameter_sweep(mod_type, grid, n_bits, seed, f_delta=None, pulse=None, workers=1,
+                           _progress=None):
+    """`parameter_sweep` backed by `disk_cache`: cells computed before, by any session, are reused."""
+    return parameter_sweep(mod_type, grid, n_bits, seed=seed, f_delta=f_delta, pulse=pulse,
+                           workers=workers, cache=disk_cache, progress=_progress)
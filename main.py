@@ -1,9 +1,47 @@
 import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
-from numpy import pi
+from plotly.subplots import make_subplots
+import os
 from pathlib import Path
 
+import caching
+from caching import (
+    cached_ber_sweep,
+    cached_compare,
+    cached_constellation,
+    cached_eye,
+    cached_load_bits,
+    cached_parameter_sweep,
+    cached_psd,
+    cached_spectrogram,
+    recover_bits,
+    simulate,
+    simulate_baseband,
+)
+from modulation import (
+    BIT_FORMATS,
+    COMPARE_TYPES,
+    DOMAINS,
+    LINEAR_TYPES,
+    MOD_TYPES,
+    NEEDS_F_DELTA,
+    PULSE_SHAPES,
+    PulseShape,
+    SWEEP_METRICS,
+    SWEEP_PARAMS,
+    WINDOWS,
+    baseband_sps,
+    ebn0_from_snr,
+    ideal_points,
+    minmax_decimate,
+    parse_bits,
+    passband_window,
+    upconvert,
+    visible_window,
+    whole_symbol_bits,
+)
+
 # --------- CONFIG (ONLY ONCE) ----------
 st.set_page_config(
     page_title="Digital Modulation Visualizer | BMSCE",
@@ -89,7 +127,8 @@ def page_constraints():
         st.markdown("### Signal Parameters")
         st.markdown(
             """
-            - **Bit Stream**: Binary sequence (e.g. `10110011`)  
+            - **Bit Stream**: Binary sequence (e.g. `10110011`), or an uploaded file
+              (raw binary, `0`/`1` text or hex)  
             - **Bit Rate**: `1` to `20` bits/sec  
             - **Amplitude (A)**: `1.0` to `10.0` units  
             - **Carrier Frequency (fc)**: `1` Hz to `50` Hz  
@@ -112,6 +151,10 @@ def page_constraints():
             - **QPSK**:  
               - 2 bits are grouped per symbol  
               - 4 phases used for mapping (00, 01, 11, 10)  
+
+            - **M-PSK / M-QAM** (8–256 points):  
+              - log₂M bits per symbol, Gray-coded constellation  
+              - unit average energy, scaled by `A`  
             """
         )
 
@@ -129,6 +172,14 @@ def page_constraints():
               - Phase is changed **relative** to previous symbol  
               - Bit `1` → phase toggles by `π`  
               - Bit `0` → phase stays unchanged  
+              - **DQPSK**: each Gray-coded bit pair advances the phase by `0`, `π/2`, `π` or `3π/2`  
+              - Detected by comparing each symbol with the previous one (no carrier phase reference)  
+
+            - **CPFSK / MSK / GMSK**:
+              - Phase is the running integral of the frequency, so it never jumps  
+              - CPFSK uses Δf from the slider (index `h = Δf / bit_rate`)  
+              - MSK fixes `h = 0.5`; GMSK adds a Gaussian pre-filter (`BT = 0.3`)  
+              - Detected with a differential phase discriminator  
             """
         )
 
@@ -138,6 +189,9 @@ def page_constraints():
             - Time axis is scaled using **bit duration** `T_b = 1 / bit_rate`.  
             - Total simulation time = `len(bits) × T_b`.  
             - Noise is **additive white Gaussian noise (AWGN)**.  
+            - Linear schemes (ASK, PSK, QAM, DPSK) can use **RRC / RC / Gaussian** pulses instead of
+              rectangular ones for a narrower spectrum; the receiver uses a matched filter, which is
+              ISI-free only for RRC.  
             - Visualization is intended for **educational use**,
               not for strict standard-compliant physical layer design.
             """
@@ -163,6 +217,80 @@ def page_constraints():
         st.rerun()   # ✅ updated
 
 
+# --------- PLOT HELPERS ----------
+# Largest waveform (in samples) generated for the on-screen views
+MAX_WAVEFORM_SAMPLES = 5_000_000
+
+# Above this many points per trace SVG rendering stalls, so switch to WebGL
+WEBGL_THRESHOLD = 10_000
+PULSE_LABELS = {"rect": "Rectangular", "rrc": "Root raised cosine", "rc": "Raised cosine",
+                "gaussian": "Gaussian"}
+
+# Recovered bits printed under the waveform, and bit errors shaded on it
+MAX_BITS_SHOWN = 512
+MAX_ERROR_SHADES = 100
+
+# Transmitted / received line colours in the comparison small multiples
+COMPARE_COLORS = ("#636efa", "#ef553b")
+
+# Sweep explorer
+SWEEP_LABELS = {"snr_db": "SNR (dB)", "fc": "Carrier Frequency (Hz)", "fs": "Samples per bit",
+                "bit_rate": "Bit Rate (bits/sec)", "A": "Amplitude"}
+SWEEP_METRIC_LABELS = {"ber": "BER", "bandwidth": "99% occupied bandwidth (Hz)",
+                       "papr_db": "Peak-to-average power (dB)"}
+
+# Spectrogram heatmap cells (time x frequency) after max pooling
+MAX_SPECTROGRAM_FRAMES = 600
+MAX_SPECTROGRAM_BINS = 300
+
+
+def parse_grid(text):
+    """Values from `"a, b, c"` or an inclusive `"start:stop:step"` range."""
+    text = text.strip()
+    try:
+        if ":" in text:
+            start, stop, step = (float(v) for v in text.split(":"))
+            if step <= 0:
+                raise ValueError
+            values = np.arange(start, stop + step / 2, step)
+        else:
+            values = np.array([float(v) for v in text.split(",") if v.strip()])
+    except ValueError:
+        raise ValueError(f"Cannot read '{text}': use e.g. '0, 5, 10' or '0:10:5'.") from None
+    if len(values) == 0:
+        raise ValueError("Every sweep parameter needs at least one value.")
+    return np.round(values, 9)
+
+
+def waveform_traces(traces, dt, renderer="Auto"):
+    """Build line traces for `[(name, x, y), ...]` sampled every `dt` seconds.
+
+    Renderer "Auto" uses Scattergl once any trace exceeds WEBGL_THRESHOLD.
+    Traces that are still on the uniform time grid are sent as `x0`/`dx`
+    instead of an x array, so the shared time axis is not transferred per trace.
+    """
+    if renderer == "Auto":
+        use_gl = max(len(y) for _, _, y in traces) > WEBGL_THRESHOLD
+    else:
+        use_gl = renderer == "WebGL"
+    trace_cls = go.Scattergl if use_gl else go.Scatter
+
+    out = []
+    for name, x, y in traces:
+        uniform = len(x) > 1 and np.isclose(x[-1] - x[0], (len(x) - 1) * dt)
+        if uniform:
+            out.append(trace_cls(x0=x[0], dx=dt, y=y, mode="lines", name=name))
+        else:
+            out.append(trace_cls(x=x, y=y, mode="lines", name=name))
+    return out
+
+
+def bits_markup(decided, error_mask):
+    """Markdown of the recovered bits in groups of 8, wrong bits in bold red."""
+    chars = [f":red[**{b}**]" if err else str(b) for b, err in zip(decided.tolist(), error_mask.tolist())]
+    return " ".join("".join(chars[i:i + 8]) for i in range(0, len(chars), 8))
+
+
 # --------- PAGE 2: MAIN VISUALIZER ----------
 def page_visualizer():
     st.markdown(
@@ -189,91 +317,416 @@ def page_visualizer():
     st.title("📡 Digital Modulation Visualizer — Interactive Learning Tool")
     st.markdown(
         """
-        This tool demonstrates **ASK, BPSK, QPSK, FSK, and DPSK**.  
+        This tool demonstrates **ASK, BPSK, QPSK, FSK, DPSK / DQPSK**, Gray-coded **M-PSK / M-QAM** and
+        continuous-phase **CPFSK / MSK / GMSK**.  
         Adjust parameters in the sidebar to see how digital bits map into analog waveforms.
         """
     )
 
     # ---- SIDEBAR ----
     st.sidebar.header("⚙️ Simulation Controls")
-    mod_type = st.sidebar.selectbox("Modulation Type", ["ASK", "BPSK", "QPSK", "FSK", "DPSK"])
-    bit_input = st.sidebar.text_input("Bit Stream", "10110011")
+    mod_type = st.sidebar.selectbox("Modulation Type", MOD_TYPES)
+    bit_source = st.sidebar.radio("Bit Source", ["Text", "File"], horizontal=True)
+    if bit_source == "Text":
+        bit_input = st.sidebar.text_input("Bit Stream", "10110011")
+    else:
+        upload = st.sidebar.file_uploader("Bit File", help="Raw binary, ASCII '0'/'1' text, or hex digits.")
+        bit_format = st.sidebar.selectbox("File Format", BIT_FORMATS)
     bit_rate = st.sidebar.slider("Bit Rate (bits/sec)", 1, 20, 5)
     A = st.sidebar.slider("Amplitude", 1.0, 10.0, 3.0)
     fc = st.sidebar.slider("Carrier Frequency (Hz)", 1.0, 50.0, 10.0)
     fs = st.sidebar.slider("Samples per bit", 50, 1000, 300)
     snr_db = st.sidebar.slider("SNR (dB)", -5, 40, 25)
+    seed = st.sidebar.number_input("Noise Seed", min_value=0, max_value=2**32 - 1, value=0, step=1)
 
-    if mod_type == "FSK":
+    domain = st.sidebar.radio(
+        "Simulation Domain", DOMAINS, horizontal=True,
+        format_func=lambda d: "Passband" if d == "passband" else "Complex baseband",
+        help="Complex baseband simulates the IQ envelope at a few samples per bit and only "
+             "upconverts the displayed window to the carrier.",
+    )
+
+    st.sidebar.subheader("🖥️ Display")
+    full_res = st.sidebar.checkbox("Full resolution plot", value=False)
+    max_points = st.sidebar.slider("Max points per trace", 500, 20000, 4000, step=500, disabled=full_res)
+    renderer = st.sidebar.radio("Renderer", ["Auto", "SVG", "WebGL"], horizontal=True,
+                                help=f"Auto switches to WebGL above {WEBGL_THRESHOLD:,} points per trace.")
+
+    if mod_type in NEEDS_F_DELTA:
         f_delta = st.sidebar.slider("Frequency Separation (Hz)", 2.0, 20.0, 6.0)
     else:
         f_delta = None
 
+    pulse = None
+    if mod_type in LINEAR_TYPES:
+        shape = st.sidebar.selectbox("Pulse Shape", PULSE_SHAPES, format_func=PULSE_LABELS.get)
+        if shape != "rect":
+            beta = st.sidebar.slider("Bandwidth-time product BT" if shape == "gaussian" else "Roll-off β",
+                                     0.1 if shape == "gaussian" else 0.0, 1.0, 0.35, step=0.05)
+            span = st.sidebar.slider("Filter span (symbols)", 2, 16, 8, step=2)
+            pulse = PulseShape(shape, beta, span)
+
     # ---- DATA PREP ----
-    bits = [b for b in bit_input if b in ("0", "1")]
+    if bit_source == "Text":
+        bits = parse_bits(bit_input)
+    elif upload is None:
+        st.info("⬆️ Upload a bit file in the sidebar.")
+        return
+    else:
+        try:
+            bits = cached_load_bits(upload.getvalue(), bit_format)
+        except ValueError as exc:
+            st.error(f"❌ Could not parse the uploaded file: {exc}")
+            return
     if len(bits) == 0:
         st.error("❌ Please enter a valid binary bit stream (e.g. 101010).")
         return
 
-    Tb = 1 / bit_rate
-    T = Tb * len(bits)
-    t = np.linspace(0, T, int(fs * len(bits)))
-    signal = np.zeros_like(t)
-
-    # ---- MODULATION ----
-    if mod_type == "ASK":
-        for i, b in enumerate(bits):
-            idx = (t >= i * Tb) & (t < (i + 1) * Tb)
-            carrier = np.sin(2 * pi * fc * t[idx])
-            signal[idx] = A * carrier if b == "1" else 0
-
-    elif mod_type == "BPSK":
-        for i, b in enumerate(bits):
-            idx = (t >= i * Tb) & (t < (i + 1) * Tb)
-            phase = 0 if b == "0" else pi
-            signal[idx] = A * np.sin(2 * pi * fc * t[idx] + phase)
-
-    elif mod_type == "QPSK":
-        if len(bits) % 2 != 0:
-            bits.append("0")
-        mapping = {"00": pi / 4, "01": 3 * pi / 4, "11": 5 * pi / 4, "10": 7 * pi / 4}
-        for i in range(0, len(bits), 2):
-            idx = (t >= (i / 2) * Tb) & (t < ((i / 2) + 1) * Tb)
-            phase = mapping["".join(bits[i:i + 2])]
-            signal[idx] = A * np.sin(2 * pi * fc * t[idx] + phase)
-
-    elif mod_type == "FSK":
-        f1, f2 = fc - f_delta / 2, fc + f_delta / 2
-        for i, b in enumerate(bits):
-            idx = (t >= i * Tb) & (t < (i + 1) * Tb)
-            signal[idx] = A * np.sin(2 * pi * (f1 if b == "0" else f2) * t[idx])
-
-    elif mod_type == "DPSK":
-        prev_phase = 0
-        for i, b in enumerate(bits):
-            idx = (t >= i * Tb) & (t < (i + 1) * Tb)
-            if b == "1":
-                prev_phase = (prev_phase + pi) % (2 * pi)
-            signal[idx] = A * np.sin(2 * pi * fc * t[idx] + prev_phase)
-
-    # ---- NOISE ----
-    sig_power = np.mean(signal ** 2)
-    noise_power = sig_power / (10 ** (snr_db / 10))
-    noise = np.sqrt(noise_power) * np.random.randn(len(signal))
-    rx = signal + noise
+    # The simulated signal holds fs samples per bit in passband but only
+    # baseband_sps in baseband; long uploads are truncated to the sample budget
+    sps = fs if domain == "passband" else baseband_sps(mod_type, bit_rate, f_delta)
+    max_bits = max(1, MAX_WAVEFORM_SAMPLES // sps)
+    if len(bits) > max_bits:
+        st.info(f"ℹ️ {len(bits):,} bits loaded; the simulation uses the first {max_bits:,} "
+                f"({MAX_WAVEFORM_SAMPLES:,} samples).")
+        bits = bits[:max_bits]
+
+    # ---- MODULATION + NOISE (memoized) ----
+    if domain == "passband":
+        t, signal, rx = simulate(mod_type, bits, bit_rate, A, fc, fs, snr_db, f_delta, int(seed),
+                                 pulse)
+        t_end = t[-1]
+    else:
+        t_bb, x_bb, r_bb = simulate_baseband(mod_type, bits, bit_rate, A, fs, snr_db, f_delta, int(seed),
+                                             pulse)
+        t_end = whole_symbol_bits(mod_type, len(bits)) / bit_rate
+
+    decided = recover_bits(domain, mod_type, bits, bit_rate, A, fc, fs, snr_db, f_delta, int(seed),
+                           pulse)
+    error_mask = decided != bits
+    errors = np.flatnonzero(error_mask)
+
+    with st.sidebar.expander("🗄️ Cache Stats"):
+        for stage, (hits, misses) in caching.stats.snapshot().items():
+            st.write(f"**{stage}**: {hits} hits / {misses} misses")
 
     # ---- TABS ----
-    tab1, tab2 = st.tabs(["📈 Waveform", "📘 Theory"])
+    tab_wave, tab_spec, tab_sgram, tab_const, tab_eye, tab_cmp, tab_ber, tab_sweep, tab_theory = st.tabs(
+        ["📈 Waveform", "📊 Spectrum", "🌊 Spectrogram", "✳️ Constellation", "👁️ Eye Diagram", "🆚 Compare",
+         "📉 BER", "🧮 Sweep", "📘 Theory"])
 
-    with tab1:
+    with tab_wave:
         st.subheader(f"🧩 {mod_type} Waveform Visualization")
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=t, y=signal, mode="lines", name="Transmitted"))
-        fig.add_trace(go.Scatter(x=t, y=rx, mode="lines", name="Received (Noisy)"))
-        fig.update_layout(template="plotly_dark", xaxis_title="Time (s)", yaxis_title="Amplitude")
+        # Box-selecting an x-range re-requests that window from the cached signal
+        window = st.session_state.get("wave_window")
+        if window is not None and not (window[0] < t_end and window[1] > 0):
+            window = st.session_state.wave_window = None
+        x0, x1 = window if window is not None else (0.0, t_end)
+
+        if domain == "passband":
+            t_win, tx_win = visible_window(t, signal, x0, x1)
+            _, rx_win = visible_window(t, rx, x0, x1)
+        else:
+            # Upconvert only the visible window, at most MAX_WAVEFORM_SAMPLES long: exact
+            # carrier for the symbols plus the interpolated noise envelope
+            if x1 - x0 > MAX_WAVEFORM_SAMPLES / (fs * bit_rate):
+                x1 = x0 + MAX_WAVEFORM_SAMPLES / (fs * bit_rate)
+                st.caption(f"Showing {x0:.4f}–{x1:.4f} s of {t_end:.4f} s "
+                           f"({MAX_WAVEFORM_SAMPLES:,} passband samples).")
+            t_win, tx_win = passband_window(mod_type, bits, bit_rate, A, fc, fs, x0, x1, f_delta,
+                                            pulse)
+            rx_win = tx_win + upconvert(t_bb, r_bb - x_bb, fc, t_win, hold=False)
+
+        n_visible = len(t_win)
+        if full_res:
+            t_tx, y_tx, t_rx, y_rx = t_win, tx_win, t_win, rx_win
+        else:
+            t_tx, y_tx = minmax_decimate(t_win, tx_win, max_points)
+            t_rx, y_rx = minmax_decimate(t_win, rx_win, max_points)
+        if len(t_rx) < n_visible:
+            st.caption(f"Showing min/max envelope: {len(t_rx):,} of {n_visible:,} samples per trace. "
+                       "Drag-select a time range to load it at full resolution.")
+        elif window is not None:
+            st.caption(f"Zoomed to {x0:.4f}–{x1:.4f} s at full resolution ({n_visible:,} samples).")
+
+        fig = go.Figure(waveform_traces(
+            [("Transmitted", t_tx, y_tx), ("Received (Noisy)", t_rx, y_rx)],
+            dt=1 / (bit_rate * fs), renderer=renderer,
+        ))
+        # Mark the bits the receiver got wrong: a marker per bit, shading while few are visible
+        starts = errors / bit_rate
+        visible = errors[(starts < x1) & (starts + 1 / bit_rate > x0)]
+        if len(visible):
+            fig.add_trace(go.Scatter(
+                x=(visible + 0.5) / bit_rate, y=np.full(len(visible), 1.15 * A), mode="markers",
+                name="Bit errors", marker=dict(symbol="x", size=9, color="#ff4b4b"),
+            ))
+            if len(visible) <= MAX_ERROR_SHADES:
+                for k in visible:
+                    fig.add_vrect(x0=k / bit_rate, x1=(k + 1) / bit_rate, fillcolor="#ff4b4b",
+                                  opacity=0.15, line_width=0, layer="below")
+        fig.update_layout(template="plotly_dark", xaxis_title="Time (s)", yaxis_title="Amplitude",
+                          dragmode="select", selectdirection="h")
+        event = st.plotly_chart(fig, use_container_width=True, key="waveform_chart",
+                                on_select="rerun", selection_mode="box")
+
+        boxes = event.selection.get("box", []) if event else []
+        if boxes:
+            box = tuple(sorted(boxes[-1]["x"]))
+            if box != st.session_state.get("wave_last_box"):
+                st.session_state.wave_last_box = box
+                st.session_state.wave_window = box
+                st.rerun()
+        if window is not None and st.button("🔍 Reset zoom"):
+            st.session_state.wave_window = None
+            st.rerun()
+
+        st.markdown("#### 🔁 Recovered Bits")
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Bits sent", f"{len(bits):,}")
+        c2.metric("Bit errors", f"{len(errors):,}")
+        c3.metric("BER", f"{len(errors) / len(bits):.2e}")
+        shown = min(len(bits), MAX_BITS_SHOWN)
+        st.markdown(bits_markup(decided[:shown], error_mask[:shown]))
+        if shown < len(bits):
+            st.caption(f"First {shown:,} of {len(bits):,} bits; errors in bold red.")
+        if len(errors):
+            listed = ", ".join(str(k) for k in errors[:50])
+            st.caption(f"Error positions (bit index): {listed}{' …' if len(errors) > 50 else ''}")
+
+    with tab_spec:
+        st.subheader(f"📊 {mod_type} Power Spectral Density")
+        c1, c2 = st.columns(2)
+        nperseg = c1.select_slider("Segment length (samples)", [2 ** k for k in range(8, 17)], value=4096,
+                                   help="Longer segments give finer frequency resolution and fewer averages.")
+        psd_window = c2.selectbox("Window", WINDOWS)
+        f, p_tx, p_rx = cached_psd(domain, mod_type, bits, bit_rate, A, fc, fs, snr_db, f_delta, int(seed),
+                                   pulse, nperseg, psd_window)
+        traces = []
+        for name, p in [("Transmitted", p_tx), ("Received (Noisy)", p_rx)]:
+            db = 10 * np.log10(np.maximum(p, 1e-30))
+            f_plot, db_plot = (f, db) if full_res else minmax_decimate(f, db, max_points)
+            traces.append((name, f_plot, db_plot))
+        fig = go.Figure(waveform_traces(traces, dt=f[1] - f[0], renderer=renderer))
+        # Open on the band around the carrier; the full range is a zoom-out away
+        span = 8 * bit_rate + (f_delta or 0)
+        fig.update_layout(template="plotly_dark", xaxis_title="Frequency (Hz)", yaxis_title="PSD (dB/Hz)",
+                          xaxis_range=[max(0.0, fc - span), min(f[-1], fc + span)])
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption(f"Welch estimate, {psd_window} window, 50% overlap; resolution {f[1] - f[0]:.3g} Hz."
+                   + (" The complex-baseband envelope only covers the band shown around fc."
+                      if domain == "baseband" else ""))
+
+    with tab_sgram:
+        st.subheader(f"🌊 {mod_type} Spectrogram")
+        c1, c2 = st.columns(2)
+        frame_bits = c1.select_slider("Frame length (bit periods)", [0.5, 1, 2, 4, 8, 16], value=1,
+                                      help="Short frames follow fast frequency changes (e.g. FSK tones); "
+                                           "long frames resolve closer frequencies.")
+        sgram_window = c2.selectbox("Window", WINDOWS, key="sgram_window")
+        span = 8 * bit_rate + (f_delta or 0)
+        t_s, f_s, p_s = cached_spectrogram(domain, mod_type, bits, bit_rate, A, fc, fs, snr_db, f_delta,
+                                           int(seed), pulse, frame_bits, sgram_window, max(0.0, fc - span),
+                                           fc + span, MAX_SPECTROGRAM_FRAMES, MAX_SPECTROGRAM_BINS)
+        fig = go.Figure(go.Heatmap(
+            x=t_s, y=f_s, z=10 * np.log10(np.maximum(p_s, 1e-30)), colorscale="Viridis",
+            colorbar=dict(title="dB/Hz"), hovertemplate="%{x:.3f} s, %{y:.2f} Hz: %{z:.1f} dB<extra></extra>"))
+        fig.add_hline(y=fc, line_dash="dot", line_color="#ff4b4b")
+        fig.update_layout(template="plotly_dark", xaxis_title="Time (s)", yaxis_title="Frequency (Hz)",
+                          height=500)
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption(f"Received signal, {frame_bits:g}-bit {sgram_window} frames with 50% overlap "
+                   f"(resolution ≈ {bit_rate / frame_bits:.3g} Hz); peaks kept when frames or bins "
+                   "are merged for display. The dotted line marks fc.")
+
+    with tab_const:
+        st.subheader(f"✳️ {mod_type} Constellation")
+        if mod_type not in LINEAR_TYPES:
+            st.info(f"{mod_type} carries bits in its frequency, not in fixed I/Q symbol points; "
+                    "see the Spectrum tab instead.")
+        else:
+            bins = st.select_slider("Histogram bins per axis", [32, 64, 128, 256], value=128)
+            (i_c, q_c, counts), sample, n_sym = cached_constellation(
+                domain, mod_type, bits, bit_rate, A, fc, fs, snr_db, f_delta, int(seed), pulse, bins)
+            ideal = ideal_points(mod_type)
+            fig = go.Figure([
+                go.Heatmap(x=i_c, y=q_c, z=np.log10(1 + counts), colorscale="Viridis", name="Density",
+                           colorbar=dict(title="log₁₀(1+n)"), hovertemplate="I %{x:.2f}, Q %{y:.2f}<extra></extra>"),
+                go.Scattergl(x=sample.real, y=sample.imag, mode="markers", name="Received (sample)",
+                             marker=dict(size=3, color="rgba(255,255,255,0.5)")),
+                go.Scatter(x=ideal.real, y=ideal.imag, mode="markers", name="Ideal",
+                           marker=dict(symbol="x", size=10, color="#ff4b4b")),
+            ])
+            fig.update_layout(template="plotly_dark", xaxis_title="In-phase (I)", yaxis_title="Quadrature (Q)",
+                              yaxis_scaleanchor="x", height=600)
+            st.plotly_chart(fig, use_container_width=True)
+            st.caption(f"Matched-filter outputs of {n_sym:,} symbols, normalized by A, binned into a "
+                       f"{bins}×{bins} heatmap; {len(sample):,} of them drawn as points.")
+
+    with tab_eye:
+        st.subheader(f"👁️ {mod_type} Eye Diagram")
+        if mod_type not in LINEAR_TYPES:
+            st.info(f"{mod_type} has no symbol amplitudes to sample; the eye diagram covers the "
+                    "linearly modulated schemes.")
+        else:
+            c1, c2 = st.columns(2)
+            component = c1.radio("Component", ["I", "Q"], horizontal=True)
+            eye_bins = c2.select_slider("Amplitude bins", [32, 64, 128, 256], value=128)
+            (t_c, y_c, counts), n_windows = cached_eye(
+                domain, mod_type, bits, bit_rate, A, fc, fs, snr_db, f_delta, int(seed), pulse,
+                component, eye_bins)
+            fig = go.Figure(go.Heatmap(
+                x=t_c, y=y_c, z=np.log10(1 + counts), colorscale="Viridis",
+                colorbar=dict(title="log₁₀(1+n)"), hovertemplate="t %{x:.2f} T, %{y:.2f}<extra></extra>"))
+            fig.add_vline(x=0, line_dash="dot", line_color="#ff4b4b")
+            fig.update_layout(template="plotly_dark", xaxis_title="Time from sampling instant (symbols)",
+                              yaxis_title=f"Matched-filter output, {component} / A", height=550)
+            st.plotly_chart(fig, use_container_width=True)
+            st.caption(f"{n_windows:,} two-symbol windows of the matched-filter output, binned into a "
+                       "density map; the dotted line marks the sampling instant.")
+
+    with tab_cmp:
+        st.subheader("🆚 Scheme Comparison")
+        st.markdown(f"{', '.join(COMPARE_TYPES)} on the same bits and the same noise realization, "
+                    "generated together in one pass (passband, rectangular pulses).")
+        if f_delta is None:
+            cmp_f_delta = st.slider("FSK frequency separation (Hz)", 2.0, 20.0, 6.0, key="cmp_f_delta")
+        else:
+            cmp_f_delta = f_delta
+        # Always passband, so the baseband domain's longer streams are truncated again
+        cmp_bits = bits[:max(1, MAX_WAVEFORM_SAMPLES // fs)]
+        t_c, sig_c, rx_c, summary = cached_compare(cmp_bits, bit_rate, A, fc, fs, snr_db, cmp_f_delta,
+                                                   int(seed))
+
+        # Small multiples over the same time range as the Waveform tab
+        fig = make_subplots(rows=len(COMPARE_TYPES), cols=1, shared_xaxes=True, vertical_spacing=0.03,
+                            subplot_titles=COMPARE_TYPES)
+        limit = None if full_res else max_points
+        for row, (tx_row, rx_row) in enumerate(zip(sig_c, rx_c)):
+            t_tx, y_tx = visible_window(t_c, tx_row, x0, x1, limit)
+            t_rx, y_rx = visible_window(t_c, rx_row, x0, x1, limit)
+            traces = waveform_traces([("Transmitted", t_tx, y_tx), ("Received (Noisy)", t_rx, y_rx)],
+                                     dt=1 / (bit_rate * fs), renderer=renderer)
+            for trace, color in zip(traces, COMPARE_COLORS):
+                trace.update(line_color=color, legendgroup=trace.name, showlegend=row == 0)
+                fig.add_trace(trace, row=row + 1, col=1)
+        fig.update_layout(template="plotly_dark", height=170 * len(COMPARE_TYPES))
+        fig.update_xaxes(title_text="Time (s)", row=len(COMPARE_TYPES), col=1)
         st.plotly_chart(fig, use_container_width=True)
 
-    with tab2:
+        st.dataframe(summary, hide_index=True, use_container_width=True, column_config={
+            "BER": st.column_config.NumberColumn(format="%.2e"),
+            "Theoretical BER": st.column_config.NumberColumn(format="%.2e"),
+            "99% bandwidth (Hz)": st.column_config.NumberColumn(format="%.2f"),
+            "PSD peak (Hz)": st.column_config.NumberColumn(format="%.2f"),
+        })
+        st.caption(f"{len(cmp_bits):,} bits at SNR {snr_db} dB (Eb/N0 {ebn0_from_snr(snr_db, fs):.1f} dB). "
+                   "Bandwidth is the band holding 99% of the clean signal's Welch PSD.")
+
+    with tab_ber:
+        st.subheader(f"📉 {mod_type} Bit Error Rate vs. Eb/N0")
+        st.markdown(
+            "Monte Carlo simulation with correlation receivers (differential for DPSK/DQPSK), compared against theory. "
+            "Runs at a light setting (8 samples/bit passband with the carrier on whole cycles per bit, "
+            "or a few samples/bit in complex baseband) independent of the waveform sliders; "
+            "the noise seed and simulation domain are shared."
+        )
+        c1, c2, c3 = st.columns(3)
+        ebn0_lo, ebn0_hi = c1.slider("Eb/N0 range (dB)", -5, 20, (0, 10))
+        n_bits = c2.select_slider("Max bits per point", [10**4, 10**5, 10**6, 10**7, 10**8], value=10**6,
+                                  format_func=lambda n: f"{n:,}")
+        workers = c3.number_input("Worker processes", 1, os.cpu_count() or 1, 1)
+        c4, c5 = st.columns(2)
+        target_errors = c4.number_input("Stop after N errors (0 = off)", 0, 10_000, 100, step=10)
+        rel_ci_width = c5.slider("Stop at relative 95% CI width (0 = off)", 0.0, 1.0, 0.0, step=0.05)
+
+        if st.button("▶️ Run BER simulation"):
+            ebn0_grid = tuple(float(x) for x in range(ebn0_lo, ebn0_hi + 1))
+            bar = st.progress(0.0, text="Simulating...")
+            st.session_state.ber_result = cached_ber_sweep(
+                mod_type, ebn0_grid, n_bits, int(seed), int(workers),
+                target_errors=int(target_errors) or None, rel_ci_width=rel_ci_width or None,
+                domain=domain, pulse=pulse,
+                _progress=lambda frac: bar.progress(frac, text=f"Simulating... {frac:.0%}"),
+            )
+            st.session_state.ber_mod_type = mod_type
+            bar.empty()
+
+        res = st.session_state.get("ber_result")
+        if res is not None and st.session_state.get("ber_mod_type") == mod_type:
+            ber = np.where(res["errors"] > 0, res["ber"], np.nan)
+            fig = go.Figure()
+            fig.add_trace(go.Scatter(x=res["ebn0_db"], y=res["theory"], mode="lines", name="Theory"))
+            fig.add_trace(go.Scatter(
+                x=res["ebn0_db"], y=ber, mode="markers", name="Simulated", marker=dict(size=9),
+                error_y=dict(type="data", symmetric=False, array=res["ci_high"] - res["ber"],
+                             arrayminus=res["ber"] - res["ci_low"]),
+            ))
+            fig.update_layout(template="plotly_dark", xaxis_title="Eb/N0 (dB)", yaxis_title="BER",
+                              yaxis_type="log")
+            st.plotly_chart(fig, use_container_width=True)
+            st.caption(f"{res['bits'].sum():,} bits in {res['elapsed']:.2f} s "
+                       f"({res['bits_per_sec'] / 1e6:.1f} Mbit/s). Error bars are 95% confidence intervals; "
+                       "points with no errors are not plotted.")
+
+    with tab_sweep:
+        st.subheader(f"🧮 {mod_type} Parameter Sweep")
+        st.markdown("Evaluate metrics over every combination of the values below. Each field takes "
+                    "comma-separated values or an inclusive `start:stop:step` range. Cells are cached "
+                    "on disk, so growing the grid only simulates the new ones.")
+        defaults = dict(snr_db="-10:10:5", fc=f"{fc:g}", fs=f"{fs}", bit_rate=f"{bit_rate}", A=f"{A:g}")
+        grid_text = {p: col.text_input(SWEEP_LABELS[p], defaults[p], key=f"sweep_{p}")
+                     for p, col in zip(SWEEP_PARAMS, st.columns(len(SWEEP_PARAMS)))}
+        c1, c2 = st.columns(2)
+        sweep_bits = c1.select_slider("Bits per cell", [1000, 2000, 5000, 10_000, 50_000], value=5000,
+                                      format_func=lambda n: f"{n:,}", key="sweep_bits")
+        sweep_workers = c2.number_input("Worker processes", 1, os.cpu_count() or 1, 1, key="sweep_workers")
+
+        if st.button("▶️ Run sweep"):
+            try:
+                grid = {p: parse_grid(text) for p, text in grid_text.items()}
+            except ValueError as exc:
+                st.error(f"❌ {exc}")
+            else:
+                bar = st.progress(0.0, text="Simulating...")
+                st.session_state.sweep_result = cached_parameter_sweep(
+                    mod_type, grid, sweep_bits, int(seed), f_delta, pulse, int(sweep_workers),
+                    _progress=lambda frac: bar.progress(frac, text=f"Simulating... {frac:.0%}"),
+                )
+                st.session_state.sweep_mod_type = mod_type
+                bar.empty()
+
+        res = st.session_state.get("sweep_result")
+        if res is not None and st.session_state.get("sweep_mod_type") == mod_type:
+            axes = res["axes"]
+            varied = [p for p in SWEEP_PARAMS if len(axes[p]) > 1] or ["snr_db"]
+            c1, c2, c3 = st.columns(3)
+            metric = c1.selectbox("Metric", SWEEP_METRICS, format_func=SWEEP_METRIC_LABELS.get)
+            x_param = c2.selectbox("X axis", varied, format_func=SWEEP_LABELS.get)
+            series = c3.selectbox("One line per", [None] + [p for p in varied if p != x_param],
+                                  format_func=lambda p: "—" if p is None else SWEEP_LABELS[p])
+            # Every other varied parameter is held at a chosen value
+            index = {}
+            fixed = [p for p in varied if p not in (x_param, series)]
+            for p, col in zip(fixed, st.columns(max(len(fixed), 1))):
+                index[p] = col.select_slider(SWEEP_LABELS[p], range(len(axes[p])),
+                                             format_func=lambda i, p=p: f"{axes[p][i]:g}")
+
+            fig = go.Figure()
+            for j in range(len(axes[series]) if series else 1):
+                sel = tuple(slice(None) if p == x_param else j if p == series else index.get(p, 0)
+                            for p in SWEEP_PARAMS)
+                name = f"{SWEEP_LABELS[series]} = {axes[series][j]:g}" if series else SWEEP_METRIC_LABELS[metric]
+                fig.add_trace(go.Scatter(x=axes[x_param], y=res[metric][sel], mode="lines+markers", name=name))
+            fig.update_layout(template="plotly_dark", xaxis_title=SWEEP_LABELS[x_param],
+                              yaxis_title=SWEEP_METRIC_LABELS[metric],
+                              yaxis_type="log" if metric == "ber" else "linear")
+            st.plotly_chart(fig, use_container_width=True)
+            st.caption(f"{res['simulated']:,} cells simulated, {res['cached']:,} loaded from the disk cache. "
+                       "Metrics do not depend on the amplitude, so A is evaluated once and shared."
+                       + (" Zero BER is not drawn on the log axis." if metric == "ber" else ""))
+
+    with tab_theory:
         st.subheader(f"📘 Understanding {mod_type}")
         st.write("You can fill detailed theory content here if needed.")
 
@@ -0,0 +1,199 @@
+"""Headless digital modulation core: arrays in, arrays out, no Streamlit."""
+
+from .baseband import (
+    average_envelope_power,
+    baseband_awgn,
+    baseband_demodulate,
+    baseband_modulate,
+    baseband_sps,
+    baseband_symbol_points,
+    passband_window,
+    upconvert,
+)
+from .ber import DOMAINS, ber_params, ber_sweep, ebn0_from_snr, snr_from_ebn0, theoretical_ber
+from .bits import BIT_FORMATS, load_bits, parse_bits, parse_hex, unpack_bytes
+from .channel import awgn, seed_sequence, spawn_seeds, standard_noise
+from .compare import COMPARE_TYPES, awgn_all, compare_summary, modulate_all
+from .constellation import (
+    constellation_table,
+    gray_code,
+    map_bits,
+    pack_symbols,
+    slice_symbols,
+    unpack_symbols,
+)
+from .cpm import CPM_TYPES, cpfsk, cpm_phase, discriminator, gmsk, msk
+from .decimate import max_pool, minmax_decimate, visible_window
+from .demod import demodulate, mix_down, symbol_points
+from .density import eye_density, eye_windows, iq_density, subsample
+from .differential import (
+    DIFF_TYPES,
+    DifferentialDetector,
+    diff_decode,
+    diff_encode,
+    differential_detect,
+)
+from .diskcache import DiskCache, cache_key
+from .filters import StreamingFIR, StreamingUpFIR, fft_convolve, moving_average, upfirdn
+from .pulses import (
+    PULSE_SHAPES,
+    PulseShape,
+    PulseShaper,
+    matched_filter,
+    matched_filter_output,
+    pulse_taps,
+    shape_symbols,
+)
+from .schemes import (
+    LINEAR_TYPES,
+    MOD_TYPES,
+    MARY_TYPES,
+    MODULATORS,
+    NEEDS_F_DELTA,
+    ask,
+    average_power,
+    bpsk,
+    dpsk,
+    dqpsk,
+    fsk,
+    ideal_points,
+    iq_symbols,
+    keyed_carrier,
+    mary,
+    modulate,
+    qpsk,
+    shaped_envelope,
+    symbol_bits,
+    symbol_index,
+    time_axis,
+    whole_symbol_bits,
+)
+from .spectrum import (
+    WINDOWS,
+    Spectrogram,
+    envelope_to_passband,
+    occupied_bandwidth,
+    spectrogram,
+    welch_psd,
+    window_array,
+)
+from .stream import (
+    StreamModulator,
+    awgn_stream,
+    demodulate_stream,
+    modulate_stream,
+    simulate_stream,
+    spectrogram_stream,
+)
+from .sweep import SWEEP_METRICS, SWEEP_PARAMS, papr_db, parameter_sweep, sweep_column
+
+__all__ = [
+    "BIT_FORMATS",
+    "COMPARE_TYPES",
+    "CPM_TYPES",
+    "DIFF_TYPES",
+    "DOMAINS",
+    "DifferentialDetector",
+    "DiskCache",
+    "LINEAR_TYPES",
+    "MARY_TYPES",
+    "MOD_TYPES",
+    "MODULATORS",
+    "NEEDS_F_DELTA",
+    "PULSE_SHAPES",
+    "PulseShape",
+    "PulseShaper",
+    "SWEEP_METRICS",
+    "SWEEP_PARAMS",
+    "Spectrogram",
+    "StreamModulator",
+    "StreamingFIR",
+    "StreamingUpFIR",
+    "WINDOWS",
+    "ask",
+    "average_envelope_power",
+    "average_power",
+    "awgn",
+    "awgn_all",
+    "awgn_stream",
+    "baseband_awgn",
+    "baseband_demodulate",
+    "baseband_modulate",
+    "baseband_sps",
+    "baseband_symbol_points",
+    "ber_params",
+    "ber_sweep",
+    "bpsk",
+    "cache_key",
+    "compare_summary",
+    "constellation_table",
+    "cpfsk",
+    "cpm_phase",
+    "demodulate",
+    "demodulate_stream",
+    "diff_decode",
+    "diff_encode",
+    "differential_detect",
+    "discriminator",
+    "dpsk",
+    "dqpsk",
+    "ebn0_from_snr",
+    "envelope_to_passband",
+    "eye_density",
+    "eye_windows",
+    "fft_convolve",
+    "fsk",
+    "gmsk",
+    "gray_code",
+    "ideal_points",
+    "iq_density",
+    "iq_symbols",
+    "keyed_carrier",
+    "load_bits",
+    "map_bits",
+    "mary",
+    "matched_filter",
+    "matched_filter_output",
+    "max_pool",
+    "minmax_decimate",
+    "mix_down",
+    "modulate",
+    "modulate_all",
+    "modulate_stream",
+    "moving_average",
+    "msk",
+    "occupied_bandwidth",
+    "pack_symbols",
+    "papr_db",
+    "parameter_sweep",
+    "parse_bits",
+    "parse_hex",
+    "passband_window",
+    "pulse_taps",
+    "qpsk",
+    "seed_sequence",
+    "shape_symbols",
+    "shaped_envelope",
+    "simulate_stream",
+    "slice_symbols",
+    "snr_from_ebn0",
+    "spawn_seeds",
+    "spectrogram",
+    "spectrogram_stream",
+    "standard_noise",
+    "subsample",
+    "sweep_column",
+    "symbol_bits",
+    "symbol_index",
+    "symbol_points",
+    "theoretical_ber",
+    "time_axis",
+    "unpack_bytes",
+    "unpack_symbols",
+    "upconvert",
+    "upfirdn",
+    "visible_window",
+    "welch_psd",
+    "whole_symbol_bits",
+    "window_array",
+]
@@ -0,0 +1,257 @@
+"""Monte Carlo bit-error-rate simulation.
+
+Each SNR point is split into fixed-size batches of random bits that are
+modulated, passed through AWGN and demodulated with the coherent correlators
+of `demod`. Batches are independent tasks with their own spawned seed
+sequence, so they can run on a `ProcessPoolExecutor` and the result for a
+given seed does not depend on the number of workers.
+
+SNR is given as Eb/N0. For a real passband signal of mean power P sampled at
+`sps` samples per bit, the per-sample noise variance is P * sps / (2 Eb/N0).
+"""
+
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from . import constellation, differential
+from .baseband import (
+    average_envelope_power,
+    baseband_awgn,
+    baseband_demodulate,
+    baseband_modulate,
+    baseband_sps,
+)
+from .channel import awgn, seed_sequence
+from .cpm import is_cpm
+from .demod import demodulate
+from .schemes import MODULATORS, average_power, modulate
+
+# Simulation defaults: 1 bit/s, carrier and FSK tones on whole cycles per bit,
+# tones orthogonal over a bit (f_delta * Tb = 2)
+BER_DEFAULTS = dict(bit_rate=1.0, A=1.0, fc=2.0, fs=8, f_delta=2.0, pulse=None)
+# CPFSK is detected by its phase trajectory rather than by tone correlation,
+# so it is simulated at h = 0.5 (the MSK index) instead of the orthogonal FSK spacing
+BER_SCHEME_DEFAULTS = {"CPFSK": dict(f_delta=0.5)}
+DEFAULT_BATCH_BITS = 1 << 16
+DOMAINS = ("passband", "baseband")
+
+
+def _q(x):
+    return 0.5 * np.vectorize(math.erfc)(np.asarray(x, dtype=float) / math.sqrt(2))
+
+
+def theoretical_ber(mod_type, ebn0_db):
+    """Theoretical BER of the detectors in `demod` over AWGN (NaN where unknown)."""
+    ebn0 = 10 ** (np.asarray(ebn0_db, dtype=float) / 10)
+    if constellation.is_mary(mod_type):
+        return constellation.theoretical_ber(mod_type, ebn0, _q)
+    if is_cpm(mod_type):
+        # No closed form for the discriminator receiver
+        return np.full(ebn0.shape, np.nan)
+    if mod_type in ("BPSK", "QPSK"):
+        return _q(np.sqrt(2 * ebn0))
+    if mod_type in ("ASK", "FSK"):
+        # On-off keying (average Eb) and orthogonal coherent FSK
+        return _q(np.sqrt(ebn0))
+    if differential.is_differential(mod_type):
+        return differential.theoretical_ber(mod_type, ebn0)
+    raise ValueError(f"Unknown modulation type: {mod_type}")
+
+
+def snr_from_ebn0(ebn0_db, sps):
+    """Per-sample SNR (dB, relative to mean signal power) for a given Eb/N0."""
+    return ebn0_db + 10 * np.log10(2 / sps)
+
+
+def ebn0_from_snr(snr_db, sps):
+    """Eb/N0 (dB) of a passband signal with per-sample SNR `snr_db`."""
+    return snr_db - 10 * np.log10(2 / sps)
+
+
+def ber_params(mod_type, params=None):
+    """Simulation parameters of `mod_type`: its defaults overridden by `params`."""
+    return {**BER_DEFAULTS, **BER_SCHEME_DEFAULTS.get(mod_type, {}), **(params or {})}
+
+
+def count_errors(mod_type, ebn0_db, n_bits, seed, params=None, domain="passband"):
+    """Simulate `n_bits` random bits at one Eb/N0. Returns `(errors, n_bits)`.
+
+    `domain` is "passband" (real carrier at `fs` samples per bit) or
+    "baseband" (complex envelope at `baseband.baseband_sps` samples per bit).
+    """
+    if domain not in DOMAINS:
+        raise ValueError(f"Unknown simulation domain: {domain}")
+    p = ber_params(mod_type, params)
+    seed = seed_sequence(seed)
+    bit_seed, noise_seed = seed.spawn(2)
+    bits = np.random.default_rng(bit_seed).integers(0, 2, n_bits, dtype=np.uint8)
+
+    if domain == "baseband":
+        sps = baseband_sps(mod_type, p["bit_rate"], p["f_delta"])
+        t, x = baseband_modulate(mod_type, bits, p["bit_rate"], p["A"], sps, p["f_delta"],
+                                 pulse=p["pulse"])
+        r = baseband_awgn(x, ebn0_db, sps, noise_seed,
+                          signal_power=average_envelope_power(mod_type, p["A"]))
+        decided = baseband_demodulate(mod_type, r, t, p["A"], sps, p["f_delta"],
+                                      p["pulse"])[:n_bits]
+        return int(np.count_nonzero(decided != bits)), n_bits
+
+    t, signal = modulate(mod_type, bits, p["bit_rate"], p["A"], p["fc"], p["fs"], p["f_delta"],
+                         pulse=p["pulse"])
+    snr_db = snr_from_ebn0(ebn0_db, p["fs"])
+    rx = awgn(signal, snr_db, noise_seed, signal_power=average_power(mod_type, p["A"]))
+    decided = demodulate(mod_type, rx, t, p["A"], p["fc"], p["fs"], p["f_delta"],
+                         p["pulse"])[:n_bits]
+    return int(np.count_nonzero(decided != bits)), n_bits
+
+
+def _run_task(task):
+    return count_errors(*task)
+
+
+def wilson_interval(errors, bits, z=1.96):
+    """Wilson score confidence interval for a BER estimate (95% by default)."""
+    errors = np.asarray(errors, dtype=float)
+    n = np.maximum(np.asarray(bits, dtype=float), 1.0)
+    p = errors / n
+    denom = 1 + z ** 2 / n
+    centre = (p + z ** 2 / (2 * n)) / denom
+    half = z * np.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / denom
+    return np.maximum(centre - half, 0.0), np.minimum(centre + half, 1.0)
+
+
+def _is_decided(errors, bits, n_bits, target_errors, rel_ci_width):
+    if bits >= n_bits:
+        return True
+    if target_errors is not None and errors >= target_errors:
+        return True
+    if rel_ci_width is not None and errors > 0:
+        lo, hi = wilson_interval(errors, bits)
+        return (hi - lo) / (errors / bits) <= rel_ci_width
+    return False
+
+
+def ber_sweep(mod_type, ebn0_db, n_bits, seed=0, workers=None, batch_bits=DEFAULT_BATCH_BITS,
+              params=None, target_errors=None, rel_ci_width=None, progress=None,
+              domain="passband"):
+    """BER at each Eb/N0 in `ebn0_db`, simulating up to `n_bits` per point.
+
+    Without `target_errors` / `rel_ci_width` every point runs all `n_bits`.
+    With them, points are simulated in batches and a point stops as soon as it
+    has `target_errors` errors or its 95% confidence interval is narrower than
+    `rel_ci_width` times the BER, whichever comes first (`n_bits` stays the
+    cap). Each scheduling round hands the available worker slots round-robin
+    to the points that are still undecided, so compute freed by finished
+    points goes to the slow ones. Points stop at the first batch prefix that
+    meets the criterion, so results for a given seed do not depend on
+    `workers`.
+
+    `domain` selects the passband or complex-baseband engine (see
+    `count_errors`); both follow the same theory curves. `workers=1` runs
+    in-process; otherwise batches are spread over a `ProcessPoolExecutor`
+    (`None` -> one worker per CPU). `progress` is called
+    as `progress(fraction)` after every batch. Returns a dict of arrays:
+    ebn0_db, errors, bits, ber, ci_low, ci_high, theory, plus the wall time
+    and throughput in bits per second.
+    """
+    if mod_type not in MODULATORS:
+        raise ValueError(f"Unknown modulation type: {mod_type}")
+    if domain not in DOMAINS:
+        raise ValueError(f"Unknown simulation domain: {domain}")
+    ebn0_db = np.atleast_1d(np.asarray(ebn0_db, dtype=float))
+    n_points = len(ebn0_db)
+    point_seeds = seed_sequence(seed).spawn(n_points)
+    n_batches = -(-n_bits // batch_bits)
+    adaptive = target_errors is not None or rel_ci_width is not None
+
+    done_batches = [{} for _ in range(n_points)]   # batch index -> (errors, bits)
+    next_batch = [0] * n_points
+    decided = [False] * n_points
+    errors = np.zeros(n_points, dtype=np.int64)
+    bits = np.zeros(n_points, dtype=np.int64)
+
+    def make_task(k):
+        j = next_batch[k]
+        next_batch[k] += 1
+        size = min(batch_bits, n_bits - j * batch_bits)
+        task_seed = np.random.SeedSequence(point_seeds[k].entropy,
+                                           spawn_key=point_seeds[k].spawn_key + (j,))
+        return k, j, (mod_type, ebn0_db[k], size, task_seed, params, domain)
+
+    def settle(k):
+        # Accumulate the contiguous batch prefix and stop at the first batch meeting the criterion
+        e = b = 0
+        for j in range(n_batches):
+            if j not in done_batches[k]:
+                break
+            e += done_batches[k][j][0]
+            b += done_batches[k][j][1]
+            if _is_decided(e, b, n_bits, target_errors, rel_ci_width):
+                decided[k] = True
+                break
+        errors[k], bits[k] = e, b
+
+    def report():
+        if progress is None:
+            return
+        frac = [1.0 if decided[k] else max(
+            bits[k] / n_bits,
+            errors[k] / target_errors if target_errors else 0.0,
+        ) for k in range(n_points)]
+        progress(min(1.0, float(np.mean(frac))))
+
+    n_workers = 1 if workers == 1 else (workers or os.cpu_count() or 1)
+    pool = ProcessPoolExecutor(max_workers=n_workers) if n_workers > 1 else None
+    start = time.perf_counter()
+    try:
+        while True:
+            open_points = [k for k in range(n_points) if not decided[k] and next_batch[k] < n_batches]
+            if not open_points:
+                break
+            if adaptive:
+                # Round-robin the worker slots over the undecided points
+                slots = max(2 * n_workers, len(open_points))
+                batch = []
+                while len(batch) < slots and open_points:
+                    for k in list(open_points):
+                        if next_batch[k] >= n_batches:
+                            open_points.remove(k)
+                        elif len(batch) < slots:
+                            batch.append(make_task(k))
+            else:
+                batch = [make_task(k) for k in open_points for _ in range(next_batch[k], n_batches)]
+
+            if pool is None:
+                for k, j, task in batch:
+                    done_batches[k][j] = _run_task(task)
+                    settle(k)
+                    report()
+            else:
+                futures = {pool.submit(_run_task, task): (k, j) for k, j, task in batch}
+                for future in as_completed(futures):
+                    k, j = futures[future]
+                    done_batches[k][j] = future.result()
+                    settle(k)
+                    report()
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    elapsed = time.perf_counter() - start
+
+    ci_low, ci_high = wilson_interval(errors, bits)
+    simulated = sum(n for point in done_batches for _, n in point.values())
+    return {
+        "ebn0_db": ebn0_db,
+        "errors": errors,
+        "bits": bits,
+        "ber": errors / np.maximum(bits, 1),
+        "ci_low": ci_low,
+        "ci_high": ci_high,
+        "theory": theoretical_ber(mod_type, ebn0_db),
+        "elapsed": elapsed,
+        "bits_per_sec": simulated / elapsed if elapsed > 0 else float("inf"),
+    }
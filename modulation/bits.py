@@ -0,0 +1,73 @@
+"""Bit stream parsing.
+
+Everything is parsed with `np.frombuffer` and byte lookup tables, so
+multi-megabyte uploads become a uint8 0/1 array without a Python-level loop.
+"""
+
+import numpy as np
+
+BIT_FORMATS = ("auto", "text", "hex", "binary")
+
+# Byte -> nibble value for hex digits, -1 for anything else
+_HEX_VALUE = np.full(256, -1, dtype=np.int16)
+for _i, _c in enumerate(b"0123456789abcdef"):
+    _HEX_VALUE[_c] = _i
+    _HEX_VALUE[ord(chr(_c).upper())] = _i
+
+_WHITESPACE = np.zeros(256, dtype=bool)
+_WHITESPACE[list(b" \t\r\n,_")] = True
+
+
+def _as_bytes(data):
+    if isinstance(data, str):
+        data = data.encode("latin-1", errors="ignore")
+    return np.frombuffer(data, dtype=np.uint8)
+
+
+def parse_bits(text):
+    """Keep the '0'/'1' characters of `text` (str or bytes) as a uint8 bit array."""
+    buf = _as_bytes(text)
+    return (buf[(buf == ord("0")) | (buf == ord("1"))] - ord("0")).astype(np.uint8)
+
+
+def parse_hex(text):
+    """Hex digits (separators and an optional 0x prefix ignored), MSB first."""
+    buf = _as_bytes(text)
+    if len(buf) >= 2 and buf[0] == ord("0") and buf[1] in (ord("x"), ord("X")):
+        buf = buf[2:]
+    nibbles = _HEX_VALUE[buf]
+    if np.any((nibbles < 0) & ~_WHITESPACE[buf]):
+        raise ValueError("Input contains non-hex characters")
+    nibbles = nibbles[nibbles >= 0].astype(np.uint8)
+    return np.unpackbits(nibbles[:, None], axis=1)[:, 4:].ravel()
+
+
+def unpack_bytes(data):
+    """Raw bytes -> bits, MSB first."""
+    return np.unpackbits(_as_bytes(data))
+
+
+def load_bits(data, fmt="auto"):
+    """Parse an uploaded payload into a uint8 bit array.
+
+    `fmt` is one of BIT_FORMATS. "auto" picks "text" when the payload only
+    holds '0'/'1' and separators, "hex" when it only holds hex digits and
+    separators, and "binary" otherwise.
+    """
+    if fmt not in BIT_FORMATS:
+        raise ValueError(f"Unknown bit format: {fmt}")
+    if fmt == "auto":
+        buf = _as_bytes(data)
+        is_bit = (buf == ord("0")) | (buf == ord("1"))
+        if np.all(is_bit | _WHITESPACE[buf]):
+            fmt = "text"
+        elif np.all((_HEX_VALUE[buf] >= 0) | _WHITESPACE[buf]):
+            fmt = "hex"
+        else:
+            fmt = "binary"
+
+    if fmt == "text":
+        return parse_bits(data)
+    if fmt == "hex":
+        return parse_hex(data)
+    return unpack_bytes(data)
@@ -0,0 +1,64 @@
+"""Channel models.
+
+Noise is drawn from `numpy.random.Generator` streams that are a pure function
+of `(seed, sample index)`: the sample axis is split into fixed blocks of
+NOISE_BLOCK samples and block `b` draws from the child seed sequence
+`SeedSequence(seed, spawn_key=(b,))` (the `b`-th `SeedSequence.spawn` child).
+The noise for a seed is therefore bit-identical however the samples are
+chunked or spread over workers.
+"""
+
+import numpy as np
+
+NOISE_BLOCK = 1 << 16
+
+
+def seed_sequence(seed=None):
+    """Normalize an int, `SeedSequence` or None (fresh entropy) to a `SeedSequence`."""
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    return np.random.SeedSequence(seed)
+
+
+def spawn_seeds(seed, n):
+    """`n` independent child seed sequences, e.g. one per worker or task."""
+    return seed_sequence(seed).spawn(n)
+
+
+def _block_rng(root, block):
+    child = np.random.SeedSequence(root.entropy, spawn_key=root.spawn_key + (block,))
+    return np.random.Generator(np.random.PCG64(child))
+
+
+def standard_noise(seed, start, n):
+    """Standard normal samples `start .. start + n - 1` of the noise stream for `seed`."""
+    root = seed_sequence(seed)
+    out = np.empty(n)
+    if n == 0:
+        return out
+    end = start + n
+    for block in range(start // NOISE_BLOCK, (end - 1) // NOISE_BLOCK + 1):
+        b0 = block * NOISE_BLOCK
+        lo, hi = max(start, b0), min(end, b0 + NOISE_BLOCK)
+        # Draw from the block start so a sample's value does not depend on the chunking
+        out[lo - start:hi - start] = _block_rng(root, block).standard_normal(hi - b0)[lo - b0:]
+    return out
+
+
+def noise_sigma(signal_power, snr_db):
+    """Noise standard deviation for a given signal power and SNR."""
+    return np.sqrt(signal_power / (10 ** (snr_db / 10)))
+
+
+def awgn(signal, snr_db, seed=None, offset=0, signal_power=None):
+    """Add white Gaussian noise at `snr_db`.
+
+    The noise power is relative to `signal_power`, or to the signal's mean
+    power when not given. `offset` is the index of `signal[0]` in the noise
+    stream, so chunks of a longer signal can be processed independently.
+    The same `seed` always yields the same noise realization; `None` draws
+    fresh entropy.
+    """
+    if signal_power is None:
+        signal_power = np.mean(signal ** 2)
+    return signal + noise_sigma(signal_power, snr_db) * standard_noise(seed, offset, len(signal))
@@ -0,0 +1,72 @@
+"""Side-by-side simulation of the basic schemes on one bit stream.
+
+The time axis is computed once and every scheme's carrier is written into
+its row of one preallocated (schemes, samples) array, each generated by the
+scheme's own modulator (so with the per-symbol carrier table where it
+applies). The noise is a single `channel` stream for the seed, scaled to
+each scheme's power, so every scheme sees the same realization.
+"""
+
+import numpy as np
+
+from .ber import ebn0_from_snr, theoretical_ber
+from .channel import noise_sigma, standard_noise
+from .demod import demodulate
+from .schemes import MODULATORS, NEEDS_F_DELTA, time_axis, whole_symbol_bits
+from .spectrum import occupied_bandwidth, welch_psd
+
+COMPARE_TYPES = ("ASK", "BPSK", "QPSK", "FSK", "DPSK")
+
+
+def modulate_all(bits, bit_rate, A, fc, fs, f_delta=None, mod_types=COMPARE_TYPES):
+    """Every scheme of `mod_types` on the same bits. Returns `(t, signals)`, one row per scheme.
+
+    The bits are padded with 0 to whole symbols of every scheme, so all rows
+    have the same length; each row equals `modulate(mod_type, ...)` of the
+    padded bits.
+    """
+    unknown = set(mod_types) - set(COMPARE_TYPES)
+    if unknown:
+        raise ValueError(f"{sorted(unknown)} not among {COMPARE_TYPES}")
+    if "FSK" in mod_types and f_delta is None:
+        raise ValueError("FSK requires f_delta")
+    fs = int(fs)
+    n_bits = max((whole_symbol_bits(m, len(bits)) for m in mod_types), default=len(bits))
+    padded = np.zeros(n_bits, dtype=np.uint8)
+    padded[:len(bits)] = bits
+    t = time_axis(n_bits, bit_rate, fs)
+    signals = np.empty((len(mod_types), len(t)))
+    for row, mod_type in enumerate(mod_types):
+        extra = (f_delta,) if mod_type in NEEDS_F_DELTA else ()
+        signals[row] = MODULATORS[mod_type](padded, t, A, fc, fs, *extra)
+    return t, signals
+
+
+def awgn_all(signals, snr_db, seed=None):
+    """`channel.awgn` on every row, all rows sharing the same unit noise samples."""
+    power = np.mean(signals ** 2, axis=1, keepdims=True)
+    return signals + noise_sigma(power, snr_db) * standard_noise(seed, 0, signals.shape[1])
+
+
+def compare_summary(mod_types, bits, t, signals, rx, bit_rate, A, fc, fs, snr_db, f_delta=None):
+    """Per-scheme BER and PSD figures for `modulate_all` / `awgn_all` output.
+
+    Returns a list of dicts: measured and theoretical BER, 99% occupied
+    bandwidth and the frequency of the PSD peak of the clean signal.
+    """
+    bits = np.asarray(bits, dtype=np.uint8)
+    ebn0_db = ebn0_from_snr(snr_db, int(fs))
+    rows = []
+    for mod_type, signal, received in zip(mod_types, signals, rx):
+        decided = demodulate(mod_type, received, t, A, fc, fs, f_delta)[:len(bits)]
+        errors = int(np.count_nonzero(decided != bits))
+        f, psd = welch_psd(signal, bit_rate * fs)
+        rows.append({
+            "Scheme": mod_type,
+            "Bit errors": errors,
+            "BER": errors / len(bits),
+            "Theoretical BER": float(theoretical_ber(mod_type, ebn0_db)),
+            "99% bandwidth (Hz)": occupied_bandwidth(f, psd),
+            "PSD peak (Hz)": float(f[np.argmax(psd)]),
+        })
+    return rows
@@ -0,0 +1,106 @@
+"""Gray-mapped M-PSK and square M-QAM constellations.
+
+Bits are packed into symbol indices with a bit-weight dot product, and each
+index is looked up in a precomputed complex table whose entry for label `v`
+is the constellation point Gray-coded as `v` (neighbouring points differ in
+one bit). Tables are normalized to unit average energy. Detection slices the
+phase (PSK) or each axis (QAM) back to a Gray label in O(n).
+"""
+
+from functools import lru_cache
+
+import numpy as np
+from numpy import pi
+
+PSK_ORDERS = (8, 16, 32, 64, 128, 256)
+QAM_ORDERS = (16, 64, 256)
+
+
+def gray_code(n):
+    """Binary-reflected Gray code of `n` (int or array)."""
+    return n ^ (n >> 1)
+
+
+def _parse(mod_type):
+    for family, orders in (("PSK", PSK_ORDERS), ("QAM", QAM_ORDERS)):
+        if mod_type.endswith(family) and mod_type[:-3].isdigit() and int(mod_type[:-3]) in orders:
+            return family, int(mod_type[:-3])
+    raise ValueError(f"Unknown modulation type: {mod_type}")
+
+
+def is_mary(mod_type):
+    """True for the generalized M-PSK / M-QAM modulation types."""
+    try:
+        _parse(mod_type)
+    except ValueError:
+        return False
+    return True
+
+
+def bits_per_symbol(mod_type):
+    return int(np.log2(_parse(mod_type)[1]))
+
+
+@lru_cache(maxsize=None)
+def constellation_table(mod_type):
+    """Unit-energy complex table indexed by Gray label (read-only)."""
+    family, M = _parse(mod_type)
+    positions = np.arange(M)
+    table = np.empty(M, dtype=complex)
+    if family == "PSK":
+        table[gray_code(positions)] = np.exp(2j * pi * positions / M)
+    else:
+        m = int(np.sqrt(M))
+        levels = 2 * np.arange(m) - m + 1
+        axis = np.empty(m)
+        axis[gray_code(np.arange(m))] = levels
+        # High half of the label selects the I level, low half the Q level
+        table[:] = (axis[positions // m] + 1j * axis[positions % m]) / np.sqrt(2 * (M - 1) / 3)
+    table.setflags(write=False)
+    return table
+
+
+def pack_symbols(bits, k):
+    """Group bits MSB-first into k-bit symbol indices (zero-padding the tail)."""
+    bits = np.asarray(bits, dtype=np.uint8)
+    pad = -len(bits) % k
+    if pad:
+        bits = np.concatenate([bits, np.zeros(pad, dtype=np.uint8)])
+    weights = 1 << np.arange(k - 1, -1, -1)
+    return bits.reshape(-1, k) @ weights
+
+
+def unpack_symbols(indices, k):
+    """Inverse of `pack_symbols`: symbol indices -> MSB-first bits."""
+    shifts = np.arange(k - 1, -1, -1)
+    return ((np.asarray(indices)[:, None] >> shifts) & 1).astype(np.uint8).ravel()
+
+
+def map_bits(mod_type, bits):
+    """Bits -> unit-energy complex symbols."""
+    return constellation_table(mod_type)[pack_symbols(bits, bits_per_symbol(mod_type))]
+
+
+def slice_symbols(mod_type, z):
+    """Nearest-point decisions for unit-energy symbol estimates `z` -> bits."""
+    family, M = _parse(mod_type)
+    k = bits_per_symbol(mod_type)
+    if family == "PSK":
+        positions = np.round(np.angle(z) * M / (2 * pi)).astype(np.int64) % M
+        labels = gray_code(positions)
+    else:
+        m = int(np.sqrt(M))
+        scaled = z * np.sqrt(2 * (M - 1) / 3)
+        i = np.clip(np.round((scaled.real + m - 1) / 2), 0, m - 1).astype(np.int64)
+        q = np.clip(np.round((scaled.imag + m - 1) / 2), 0, m - 1).astype(np.int64)
+        labels = gray_code(i) * m + gray_code(q)
+    return unpack_symbols(labels, k)
+
+
+def theoretical_ber(mod_type, ebn0, q):
+    """Gray-coded BER approximation over AWGN (`ebn0` linear, `q` the Q function)."""
+    family, M = _parse(mod_type)
+    k = bits_per_symbol(mod_type)
+    if family == "PSK":
+        return 2 / k * q(np.sqrt(2 * k * ebn0) * np.sin(pi / M))
+    return 4 / k * (1 - 1 / np.sqrt(M)) * q(np.sqrt(3 * k * ebn0 / (M - 1)))
@@ -0,0 +1,74 @@
+"""Display decimation: shrink long traces before they are sent to a plot.
+
+`minmax_decimate` splits the trace into equal buckets and keeps the minimum
+and maximum sample of each (in their original order), so every peak survives
+while the point count is capped at `max_points`. `visible_window` applies the
+same cap to a zoomed time range, giving a level-of-detail view that returns
+exact samples once the window is narrow enough. `max_pool` does the same for
+heatmaps, keeping the largest value of each block of cells.
+"""
+
+import numpy as np
+
+
+def minmax_decimate(x, y, max_points):
+    """Min/max envelope of `(x, y)` with at most `max_points` points.
+
+    Traces that already fit are returned unchanged.
+    """
+    n = len(y)
+    n_buckets = max_points // 2
+    if n <= max_points or n_buckets < 1:
+        return x, y
+
+    # Equal-size buckets over the largest prefix; the tail becomes one more bucket
+    size = -(-n // n_buckets)
+    n_full = n // size
+    body = y[:n_full * size].reshape(n_full, size)
+    lo = body.argmin(axis=1)
+    hi = body.argmax(axis=1)
+
+    starts = np.arange(n_full) * size
+    idx = np.stack([starts + np.minimum(lo, hi), starts + np.maximum(lo, hi)], axis=1).ravel()
+    if n_full * size < n:
+        tail = y[n_full * size:]
+        t_lo = n_full * size + tail.argmin()
+        t_hi = n_full * size + tail.argmax()
+        idx = np.concatenate([idx, [min(t_lo, t_hi), max(t_lo, t_hi)]])
+    return x[idx], y[idx]
+
+
+def visible_window(x, y, x0, x1, max_points=None):
+    """Slice `(x, y)` to `x0 <= x <= x1` (plus one edge sample each side).
+
+    `x` must be sorted. With `max_points` the slice is min/max decimated, so a
+    narrow enough window comes back at full resolution.
+    """
+    lo, hi = np.searchsorted(x, [x0, x1], side="left")
+    lo = max(lo - 1, 0)
+    hi = min(hi + 1, len(x))
+    xs, ys = x[lo:hi], y[lo:hi]
+    if max_points is None:
+        return xs, ys
+    return minmax_decimate(xs, ys, max_points)
+
+
+def _pool_axis(coords, z, limit, axis):
+    n = z.shape[axis]
+    if n <= limit:
+        return coords, z
+    starts = np.arange(0, n, -(-n // limit))
+    sizes = np.diff(np.append(starts, n))
+    return np.add.reduceat(coords, starts) / sizes, np.maximum.reduceat(z, starts, axis=axis)
+
+
+def max_pool(x, y, z, max_x, max_y):
+    """Shrink the grid `z[y, x]` to at most `max_y` by `max_x` cells by block maxima.
+
+    Each output cell is the maximum of a block of input cells and sits at the
+    mean coordinate of its block, so narrow peaks such as FSK tones survive.
+    Returns `(x, y, z)`.
+    """
+    x, z = _pool_axis(x, z, max_x, axis=1)
+    y, z = _pool_axis(y, z, max_y, axis=0)
+    return x, y, z
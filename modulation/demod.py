@@ -0,0 +1,154 @@
+"""Matched-filter (correlation) demodulators for the passband schemes.
+
+The received signal is reshaped into a (symbols x samples_per_symbol) matrix
+and correlated against a bank of reference carriers, one column per
+reference: the carrier for ASK/BPSK, its sine and cosine for the I/Q schemes
+(QPSK, M-ary, DPSK/DQPSK) and the two tones for FSK. When the references
+complete whole cycles per symbol they are the same for every symbol and the
+whole bank is applied in one matrix multiply; otherwise each symbol is
+correlated with the references evaluated on its own stretch of the time
+axis.
+"""
+
+import numpy as np
+from numpy import pi
+
+from . import constellation
+from .baseband import baseband_demodulate, baseband_symbol_points
+from .cpm import discriminator, is_cpm, modulation_index
+from .differential import differential_detect
+from .filters import moving_average
+from .pulses import is_shaped
+from .schemes import LINEAR_TYPES, MODULATORS, _phase_aligned, symbol_bits
+
+
+def _rows(x, sps):
+    n_sym = len(x) // sps
+    return x[:n_sym * sps].reshape(n_sym, sps)
+
+
+def reference_bank(mod_type, fc, f_delta=None):
+    """`(freqs, phases)` of the reference carriers `sin(2 pi f t + phase)` for a scheme."""
+    if mod_type in ("ASK", "BPSK"):
+        return np.array([fc]), np.array([0.0])
+    if mod_type == "FSK":
+        if f_delta is None:
+            raise ValueError("FSK requires f_delta")
+        return np.array([fc - f_delta / 2, fc + f_delta / 2]), np.zeros(2)
+    # sin(wt + phi) = cos(phi) sin(wt) + sin(phi) cos(wt): columns give I and Q
+    return np.array([fc, fc]), np.array([0.0, pi / 2])
+
+
+def correlate_bank(rx, t, sps, freqs, phases):
+    """Per-symbol correlations with every reference: an (n_symbols, n_refs) matrix."""
+    R = _rows(rx, sps)
+    dt = t[1] - t[0] if len(t) > 1 else 0.0
+    if len(t) > 1 and _phase_aligned(freqs, sps * dt):
+        j = t[0] + np.arange(sps) * dt
+        return R @ np.sin(2 * pi * j[:, None] * freqs + phases)
+    ref = np.sin(2 * pi * _rows(t, sps)[:, :, None] * freqs + phases)
+    return np.einsum("ij,ijk->ik", R, ref)
+
+
+def correlate(rx, t, sps, freq, phase=0.0):
+    """Per-symbol correlation of `rx` with `sin(2 pi freq t + phase)`."""
+    return correlate_bank(rx, t, sps, np.array([freq]), np.array([phase]))[:, 0]
+
+
+def carrier_energy(t, sps, freq):
+    """Per-symbol energy of the unit carrier `sin(2 pi freq t)`."""
+    dt = t[1] - t[0] if len(t) > 1 else 0.0
+    if len(t) > 1 and _phase_aligned(freq, sps * dt):
+        ref = np.sin(2 * pi * freq * (t[0] + np.arange(sps) * dt))
+        return np.full(len(t) // sps, ref @ ref)
+    ref = np.sin(2 * pi * freq * _rows(t, sps))
+    return np.einsum("ij,ij->i", ref, ref)
+
+
+def symbol_iq(rx, t, sym_len, fc):
+    """Per-symbol complex statistic `i + j q`; a carrier phase phi gives angle phi."""
+    Z = correlate_bank(rx, t, sym_len, *reference_bank("QPSK", fc))
+    return Z[:, 0] + 1j * Z[:, 1]
+
+
+def symbol_points(mod_type, rx, t, A, fc, fs, pulse=None):
+    """Matched-filter output per symbol of a linear scheme, scaled so symbol `A c` gives `c`.
+
+    These are the points the detector slices (for the constellation view).
+    """
+    if mod_type not in LINEAR_TYPES:
+        raise ValueError(f"{mod_type} has no symbol constellation")
+    fs = int(fs)
+    if is_shaped(pulse):
+        return baseband_symbol_points(mod_type, mix_down(rx, t, fc), A, fs, pulse)
+    sym_len = symbol_bits(mod_type) * fs
+    n = len(rx) // sym_len * sym_len
+    return symbol_iq(rx[:n], t[:n], sym_len, fc) / (A * carrier_energy(t[:n], sym_len, fc))
+
+
+def mix_down(rx, t, fc):
+    """`2j rx e^(-j 2 pi fc t)`: the complex envelope (see `baseband`) plus a 2 fc image."""
+    return 2j * rx * np.exp(-2j * pi * fc * t)
+
+
+def downconvert(rx, t, fc):
+    """Complex envelope estimate of a passband signal.
+
+    Mixes down and removes the 2 fc image with a moving average over one
+    carrier period.
+    """
+    dt = t[1] - t[0] if len(t) > 1 else 1.0
+    return moving_average(mix_down(rx, t, fc), round(1 / (fc * dt)))
+
+
+def demodulate(mod_type, rx, t, A, fc, fs, f_delta=None, pulse=None):
+    """Recover the 0/1 bits from a received passband waveform.
+
+    `fs` is samples per bit, as in `modulate`. Multi-bit symbols (QPSK,
+    M-ary, DQPSK) return whole symbols including any padding bits; DPSK/DQPSK
+    use differential detection; CPFSK/MSK/GMSK use a phase discriminator on
+    the downconverted envelope. Pulse-shaped signals are mixed down and
+    detected by the baseband matched filter, which also rejects the 2 fc
+    image.
+    """
+    if mod_type not in MODULATORS:
+        raise ValueError(f"Unknown modulation type: {mod_type}")
+    fs = int(fs)
+    if is_shaped(pulse):
+        return baseband_demodulate(mod_type, mix_down(rx, t, fc), t, A, fs, f_delta, pulse)
+    sym_len = symbol_bits(mod_type) * fs
+
+    # A trailing partial symbol is zero-padded to a whole one
+    short = -len(rx) % sym_len
+    if short:
+        rx = np.concatenate([rx, np.zeros(short)])
+        t = t[0] + np.arange(len(rx)) * (t[1] - t[0])
+
+    if is_cpm(mod_type):
+        h = modulation_index(mod_type, 1 / (fs * (t[1] - t[0])), f_delta) if len(t) > 1 else 0.5
+        return discriminator(downconvert(rx, t, fc), fs, h).astype(np.uint8)
+
+    # Every reference in one matrix multiply
+    Z = correlate_bank(rx, t, sym_len, *reference_bank(mod_type, fc, f_delta))
+    if mod_type == "ASK":
+        bits = Z[:, 0] > A * carrier_energy(t, fs, fc) / 2
+
+    elif mod_type == "BPSK":
+        bits = Z[:, 0] < 0
+
+    elif mod_type == "FSK":
+        bits = Z[:, 1] > Z[:, 0]
+
+    elif mod_type == "QPSK":
+        bits = np.empty(2 * len(Z), dtype=bool)
+        bits[0::2] = Z[:, 1] < 0
+        bits[1::2] = Z[:, 0] < 0
+
+    elif constellation.is_mary(mod_type):
+        z = (Z[:, 0] + 1j * Z[:, 1]) / (A * carrier_energy(t, sym_len, fc))
+        bits = constellation.slice_symbols(mod_type, z)
+
+    else:  # DPSK, DQPSK
+        bits = differential_detect(mod_type, Z[:, 0] + 1j * Z[:, 1])
+
+    return bits.astype(np.uint8)
@@ -0,0 +1,79 @@
+"""Density rendering: bin large point clouds into 2-D histograms.
+
+Plotting every received symbol as a marker (or every eye-diagram window as a
+line) stalls the browser beyond a few thousand of them. A fixed-size
+histogram grid costs the same to draw whatever the number of points, and a
+small random subsample can be overlaid to keep individual points visible.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+DEFAULT_BINS = 128
+DEFAULT_SAMPLE = 2000
+MAX_EYE_WINDOWS = 20_000
+MAX_EYE_COLUMNS = 200
+
+
+def iq_density(z, bins=DEFAULT_BINS, limit=None):
+    """2-D histogram of complex points on a square `[-limit, limit]` grid.
+
+    `limit` defaults to just beyond the 99.9th percentile of |I| and |Q| (and
+    at least 1.2, so noiseless unit constellations keep a margin). Returns
+    `(i_centres, q_centres, counts)` with `counts[q, i]`, the row-major layout
+    heatmaps expect.
+    """
+    z = np.asarray(z)
+    if limit is None:
+        extent = np.abs(np.concatenate([z.real, z.imag])) if len(z) else np.zeros(1)
+        limit = max(1.2, 1.1 * float(np.percentile(extent, 99.9)))
+    edges = np.linspace(-limit, limit, bins + 1)
+    counts, _, _ = np.histogram2d(z.real, z.imag, bins=[edges, edges])
+    centres = (edges[:-1] + edges[1:]) / 2
+    return centres, centres, counts.T
+
+
+def subsample(x, n=DEFAULT_SAMPLE, seed=0):
+    """At most `n` elements of `x`, drawn at random without replacement (order kept)."""
+    if len(x) <= n:
+        return x
+    idx = np.random.default_rng(seed).choice(len(x), n, replace=False)
+    return x[np.sort(idx)]
+
+
+def eye_windows(y, sym_len):
+    """Two-symbol windows of `y`, each centred on a symbol's sampling instant.
+
+    Symbol `k` is sampled at `k * sym_len + sym_len // 2`; window `k` spans one
+    symbol either side of symbol `k + 1`'s instant. The result is a zero-copy
+    strided view of shape `(n_windows, 2 * sym_len)`.
+    """
+    y = np.asarray(y)
+    if len(y) < sym_len // 2 + 2 * sym_len:
+        return np.zeros((0, 2 * sym_len), dtype=y.dtype)
+    return sliding_window_view(y[sym_len // 2:], 2 * sym_len)[::sym_len]
+
+
+def eye_density(windows, bins=DEFAULT_BINS, limit=None, max_windows=MAX_EYE_WINDOWS,
+                max_columns=MAX_EYE_COLUMNS):
+    """Histogram of eye-diagram windows over (time offset, amplitude).
+
+    At most `max_windows` evenly spaced windows are binned (still a strided
+    view), and the time axis is merged into at most `max_columns` columns.
+    `limit` defaults as in `iq_density`. Returns `(t_centres, y_centres,
+    counts)` with time in symbol periods relative to the sampling instant and
+    `counts[amplitude, time]`.
+    """
+    windows = windows[::max(1, -(-len(windows) // max_windows))]
+    n_t = windows.shape[1]
+    if limit is None:
+        limit = max(1.2, 1.1 * float(np.percentile(np.abs(windows), 99.9))) if len(windows) else 1.2
+    n_cols = min(n_t, max_columns)
+    col = np.arange(n_t) * n_cols // n_t
+    row = np.clip(((windows + limit) * (bins / (2 * limit))).astype(np.int64), 0, bins - 1)
+    counts = np.bincount((row * n_cols + col).ravel(), minlength=bins * n_cols).reshape(bins, n_cols)
+
+    sym_len = n_t // 2
+    t_centres = (np.arange(n_cols) + 0.5) * (n_t / n_cols) / sym_len - 1 - 0.5 / sym_len
+    edges = np.linspace(-limit, limit, bins + 1)
+    return t_centres, (edges[:-1] + edges[1:]) / 2, counts
@@ -0,0 +1,118 @@
+"""Content-addressed on-disk store for simulation results.
+
+An entry is one array saved as `<key>.npy` in the cache directory, where the
+key is a SHA-256 hash of the parameters that produced it (`cache_key`).
+Entries therefore survive restarts and are shared by every process using
+the same directory. Writes go to a temporary file that is renamed into
+place, so concurrent writers of the same key never leave a torn file.
+
+Entries are read back with `np.load(mmap_mode="r")`: a hit maps the file
+instead of reading it, so it costs about the same whatever the array size,
+and only the pages actually touched are read. The directory is kept under a
+byte budget by evicting the least recently used files, with recency
+recorded in each file's modification time.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_MAX_BYTES = 2 << 30
+
+
+def _jsonable(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        # Hash the contents rather than spelling out a possibly huge array
+        digest = hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest()
+        return {"dtype": value.dtype.str, "shape": value.shape, "sha256": digest}
+    return repr(value)
+
+
+def cache_key(**params):
+    """Hex digest identifying `params` (JSON-encoded with sorted keys)."""
+    text = json.dumps(params, sort_keys=True, default=_jsonable)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class DiskCache:
+    """Arrays stored under `root`, one `.npy` file per key, at most `max_bytes` in total."""
+
+    def __init__(self, root, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._size = sum(size for _, size, _ in self._entries())
+
+    def path(self, key):
+        return self.root / f"{key}.npy"
+
+    def _entries(self):
+        """`(mtime, size, path)` of every entry, least recently used first."""
+        entries = []
+        for path in self.root.glob("*.npy"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # evicted by another process meanwhile
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return sorted(entries)
+
+    def get(self, key):
+        """The array stored under `key`, memory-mapped read-only, or None."""
+        path = self.path(key)
+        try:
+            array = np.load(path, mmap_mode="r")
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            return None
+        return array
+
+    def put(self, key, array):
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.asarray(array))
+            self._size += os.path.getsize(tmp)
+            os.replace(tmp, self.path(key))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the directory fits the budget."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:  # already gone, or still mapped on a platform that forbids it
+                continue
+            total -= size
+        self._size = total
+
+    def memoize(self, compute, parts, **params):
+        """Arrays `parts` of one result, stored under hashes of `params` and the part name.
+
+        On a hit every part is memory-mapped (see `get`). Otherwise, or if a
+        part has been evicted, `compute()` is called for the tuple of arrays
+        and they are stored. Either way the arrays returned are read-only.
+        """
+        keys = [cache_key(part=part, **params) for part in parts]
+        arrays = [self.get(key) for key in keys]
+        if all(a is not None for a in arrays):
+            return tuple(arrays)
+        arrays = tuple(np.asarray(a) for a in compute())
+        for key, array in zip(keys, arrays):
+            self.put(key, array)
+            array.setflags(write=False)
+        return arrays
@@ -0,0 +1,92 @@
+"""FFT-based FIR filtering: direct, block-streamed and polyphase interpolating."""
+
+import numpy as np
+
+
+def fft_convolve(x, h):
+    """Full linear convolution of `x` and `h` via FFTs (O(n log n)); real or complex."""
+    n = len(x) + len(h) - 1
+    if len(x) == 0 or len(h) == 0:
+        return np.zeros(max(n, 0))
+    nfft = 1 << (n - 1).bit_length()
+    if np.iscomplexobj(x) or np.iscomplexobj(h):
+        return np.fft.ifft(np.fft.fft(x, nfft) * np.fft.fft(h, nfft))[:n]
+    return np.fft.irfft(np.fft.rfft(x, nfft) * np.fft.rfft(h, nfft), nfft)[:n]
+
+
+def upfirdn(x, h, up):
+    """Zero-stuff `x` by `up` and filter with `h`: full output of `(len(x) - 1) * up + len(h)`.
+
+    Polyphase form: phase `p` of the output is `x` convolved with the taps
+    `h[p::up]`, all phases in one batched FFT at the input rate, so the
+    inserted zeros are never multiplied.
+    """
+    x = np.asarray(x)
+    n_out = (len(x) - 1) * up + len(h)
+    if len(x) == 0:
+        return np.zeros(0, dtype=np.result_type(x, h))
+    n_phase = -(-len(h) // up)
+    phases = np.zeros(n_phase * up, dtype=np.asarray(h).dtype)
+    phases[:len(h)] = h
+    phases = phases.reshape(n_phase, up)
+    n = len(x) + n_phase - 1
+    nfft = 1 << (n - 1).bit_length()
+    if np.iscomplexobj(x) or np.iscomplexobj(h):
+        y = np.fft.ifft(np.fft.fft(x, nfft)[:, None] * np.fft.fft(phases, nfft, axis=0), axis=0)
+    else:
+        y = np.fft.irfft(np.fft.rfft(x, nfft)[:, None] * np.fft.rfft(phases, nfft, axis=0),
+                         nfft, axis=0)
+    return y[:n].reshape(-1)[:n_out]
+
+
+def moving_average(x, width):
+    """Centred boxcar average of `width` samples (shorter at the edges), via cumsum."""
+    width = max(1, int(width))
+    csum = np.cumsum(np.concatenate([np.zeros(1, dtype=x.dtype), x]))
+    lo = np.clip(np.arange(len(x)) - width // 2, 0, len(x))
+    hi = np.clip(lo + width, 0, len(x))
+    return (csum[hi] - csum[lo]) / (hi - lo)
+
+
+class StreamingFIR:
+    """Causal FIR filter applied block by block.
+
+    Each block is convolved together with the last `len(h) - 1` input samples
+    of the previous block and only the fully overlapped outputs are kept, so
+    the concatenated output equals `fft_convolve(x, h)[:len(x)]` for the
+    whole stream.
+    """
+
+    def __init__(self, h):
+        self.h = np.asarray(h, dtype=float)
+        self._hist = np.zeros(len(self.h) - 1)
+
+    def process(self, x):
+        x = np.asarray(x, dtype=float)
+        buf = np.concatenate([self._hist, x])
+        y = fft_convolve(buf, self.h)[len(self._hist):len(buf)]
+        self._hist = buf[len(buf) - len(self._hist):]
+        return y
+
+
+class StreamingUpFIR:
+    """Causal `upfirdn` applied block by block.
+
+    Keeps the last `ceil(len(h) / up) - 1` input samples, so every block
+    yields `len(block) * up` outputs and the concatenated output equals the
+    start of `upfirdn` on the whole stream.
+    """
+
+    def __init__(self, h, up):
+        self.h = np.asarray(h)
+        self.up = int(up)
+        self._hist = np.zeros(-(-len(self.h) // self.up) - 1)
+
+    def process(self, x):
+        x = np.asarray(x)
+        if len(x) == 0:
+            return np.zeros(0, dtype=np.result_type(x, self.h))
+        buf = np.concatenate([self._hist.astype(np.result_type(self._hist, x)), x])
+        y = upfirdn(buf, self.h, self.up)[len(self._hist) * self.up:len(buf) * self.up]
+        self._hist = buf[len(buf) - len(self._hist):]
+        return y
@@ -0,0 +1,156 @@
+"""Pulse shaping for the linearly modulated schemes.
+
+By default every symbol is a rectangular pulse, whose sinc spectrum decays
+slowly. A `PulseShape` replaces it with a root-raised-cosine, raised-cosine
+or Gaussian pulse. The complex symbols are zero-stuffed to the sample rate
+and filtered by polyphase FFT interpolation (`filters.upfirdn`), and only
+then put on the carrier, so the cost stays O(n log n) whatever the filter
+length. Taps are cached per (shape, beta, span, sps).
+
+Pulses are scaled to the energy of the rectangular pulse they replace
+(sum h^2 = sps), so mean power and the Eb/N0 conventions are unchanged. Each
+pulse peaks mid-symbol, where the rectangular pulse is centred. The receiver
+(`matched_filter`) correlates with the same pulse and samples at those
+peaks. RRC is ISI-free end to end; RC and Gaussian pulses leave some ISI
+after matched filtering.
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+from numpy import pi
+
+from .cpm import gaussian_taps
+from .filters import StreamingUpFIR, fft_convolve, moving_average, upfirdn
+
+PULSE_SHAPES = ("rect", "rrc", "rc", "gaussian")
+DEFAULT_BETA = 0.35
+DEFAULT_SPAN = 8  # filter length in symbol periods
+
+# `beta` is the roll-off factor (RRC, RC) or the bandwidth-time product (Gaussian)
+PulseShape = namedtuple("PulseShape", ["shape", "beta", "span"],
+                        defaults=("rrc", DEFAULT_BETA, DEFAULT_SPAN))
+
+
+def is_shaped(pulse):
+    """True unless `pulse` is None or rectangular."""
+    if pulse is None:
+        return False
+    if pulse.shape not in PULSE_SHAPES:
+        raise ValueError(f"Unknown pulse shape: {pulse.shape}")
+    return pulse.shape != "rect"
+
+
+def _rrc(t, beta):
+    # Removable singularities at t = 0 and |t| = 1 / (4 beta)
+    num = np.sin(pi * t * (1 - beta)) + 4 * beta * t * np.cos(pi * t * (1 + beta))
+    den = pi * t * (1 - (4 * beta * t) ** 2)
+    edge = np.isclose(np.abs(4 * beta * t), 1.0)
+    centre = np.isclose(t, 0.0)
+    h = np.divide(num, den, out=np.zeros_like(t), where=~(edge | centre))
+    h[centre] = 1 - beta + 4 * beta / pi
+    if beta > 0:
+        h[edge] = beta / np.sqrt(2) * ((1 + 2 / pi) * np.sin(pi / (4 * beta))
+                                       + (1 - 2 / pi) * np.cos(pi / (4 * beta)))
+    return h
+
+
+def _rc(t, beta):
+    edge = np.isclose(np.abs(2 * beta * t), 1.0)
+    den = np.where(edge, 1.0, 1 - (2 * beta * t) ** 2)
+    h = np.sinc(t) * np.cos(pi * beta * t) / den
+    h[edge] = pi / 4 * np.sinc(1 / (2 * beta)) if beta > 0 else 0.0
+    return h
+
+
+@lru_cache(maxsize=32)
+def pulse_taps(shape, beta, span, sps):
+    """Symmetric taps of `span * sps + 1` samples, scaled to sum h^2 = sps (read-only)."""
+    if shape == "rect":
+        taps = np.ones(sps)
+    elif shape == "gaussian":
+        taps = gaussian_taps(beta, sps, span).copy()
+    elif shape in ("rrc", "rc"):
+        t = (np.arange(span * sps + 1) - span * sps / 2) / sps
+        taps = _rrc(t, beta) if shape == "rrc" else _rc(t, beta)
+    else:
+        raise ValueError(f"Unknown pulse shape: {shape}")
+    taps *= np.sqrt(sps / np.dot(taps, taps))
+    taps.setflags(write=False)
+    return taps
+
+
+def _taps(pulse, sps):
+    return pulse_taps(pulse.shape, float(pulse.beta), int(pulse.span), int(sps))
+
+
+def _delay(taps, sps):
+    # Output samples before the first pulse peaks mid-symbol
+    return (len(taps) - 1) // 2 - sps // 2
+
+
+def shape_symbols(symbols, sps, pulse):
+    """Envelope of `symbols` at `sps` samples per symbol, `len(symbols) * sps` samples."""
+    taps = _taps(pulse, sps)
+    delay = _delay(taps, sps)
+    return upfirdn(np.asarray(symbols), taps, sps)[delay:delay + len(symbols) * sps]
+
+
+class PulseShaper:
+    """`shape_symbols` block by block.
+
+    Like `cpm.PhaseAccumulator` with GMSK, the filter delay means the first
+    samples are held back and come out of `flush`, so the concatenated output
+    equals `shape_symbols` on the whole symbol stream.
+    """
+
+    def __init__(self, sps, pulse):
+        self.sps = int(sps)
+        taps = _taps(pulse, self.sps)
+        self._fir = StreamingUpFIR(taps, self.sps)
+        self._delay = self._skip = _delay(taps, self.sps)
+        self._n_symbols = 0
+        self._emitted = 0
+
+    def _trim(self, y):
+        drop = min(self._skip, len(y))
+        y, self._skip = y[drop:], self._skip - drop
+        y = y[:self._n_symbols * self.sps - self._emitted]
+        self._emitted += len(y)
+        return y
+
+    def process(self, symbols):
+        self._n_symbols += len(symbols)
+        return self._trim(self._fir.process(np.asarray(symbols, dtype=complex)))
+
+    def flush(self):
+        """Samples held back by the filter delay."""
+        n_zero = -(-self._delay // self.sps)
+        return self._trim(self._fir.process(np.zeros(n_zero, dtype=complex)))
+
+
+def matched_filter_output(r, sps, pulse):
+    """Continuous matched-filter output, aligned with `r` and normalized like `matched_filter`.
+
+    Rectangular pulses (`pulse` None or "rect") give the one-symbol moving
+    average. Used for eye diagrams.
+    """
+    if not is_shaped(pulse):
+        return moving_average(r, sps)
+    taps = _taps(pulse, sps)
+    c = (len(taps) - 1) // 2
+    return fft_convolve(r, taps[::-1])[c:c + len(r)] / np.dot(taps, taps)
+
+
+def matched_filter(r, sps, pulse):
+    """Per-symbol matched-filter output, normalized so a lone symbol `a` gives `a`.
+
+    A trailing partial symbol is treated as zero-padded, like
+    `baseband.integrate_dump`.
+    """
+    taps = _taps(pulse, sps)
+    n_sym = -(-len(r) // sps)
+    y = fft_convolve(r, taps[::-1])
+    peaks = np.arange(n_sym) * sps + sps // 2 + (len(taps) - 1) // 2
+    return y[peaks] / np.dot(taps, taps)
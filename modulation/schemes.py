@@ -0,0 +1,246 @@
+"""Passband modulators: ASK, BPSK, QPSK, FSK, DPSK/DQPSK, Gray-mapped M-PSK/M-QAM
+and the continuous-phase CPFSK/MSK/GMSK of `cpm`.
+
+Each sample's symbol index is computed once (integer division of the sample
+index by the samples per symbol); every scheme is then a single fancy-indexed,
+broadcast expression over the whole time axis instead of a per-bit loop.
+When the carriers complete whole cycles per symbol, the candidate symbol
+waveforms are tabulated once and assembled by symbol index.
+
+The linear schemes can instead take a `pulses.PulseShape`. Their complex
+symbols are then pulse-shaped into an envelope that modulates the carrier.
+"""
+
+from functools import partial
+
+import numpy as np
+from numpy import pi
+
+from . import constellation, differential
+from .cpm import cpfsk, gmsk, msk
+from .pulses import is_shaped, shape_symbols
+
+# QPSK phase for each 2-bit symbol index (b0 * 2 + b1): 00, 01, 10, 11
+QPSK_PHASES = np.array([pi / 4, 3 * pi / 4, 7 * pi / 4, 5 * pi / 4])
+
+
+def symbol_index(n_samples, samples_per_symbol):
+    """Return the symbol number of every sample (sample index // sps)."""
+    return np.arange(n_samples) // samples_per_symbol
+
+
+def time_axis(n_bits, bit_rate, fs):
+    """Time axis with `fs` samples per bit period, aligned to bit edges."""
+    Tb = 1 / bit_rate
+    return np.arange(int(fs) * n_bits) * (Tb / int(fs))
+
+
+def _phase_aligned(freqs, symbol_duration):
+    """True when every frequency completes whole cycles per symbol."""
+    cycles = np.asarray(freqs) * symbol_duration
+    return bool(np.all(np.abs(cycles - np.round(cycles)) < 1e-9 * np.maximum(1.0, cycles)))
+
+
+def keyed_carrier(t, sps, symbols, amps, freqs, phases, table=True):
+    """`amps[s] * sin(2 pi freqs[s] t + phases[s])` with `s` the symbol of each sample.
+
+    `amps`, `freqs` and `phases` are per-alphabet-entry (scalars broadcast).
+    In table mode, when every carrier completes whole cycles per symbol, each
+    candidate symbol waveform is evaluated once into an (M, sps) table and the
+    output is assembled with `np.take` on the symbol array, so `np.sin` runs
+    M * sps times instead of once per sample. Otherwise, or when the table
+    would hold more samples than the signal (large alphabets on short
+    signals), falls back to direct evaluation.
+    """
+    n = len(t)
+    amps, freqs, phases = (np.atleast_1d(a) for a in np.broadcast_arrays(amps, freqs, phases))
+    if n == 0:
+        return np.zeros(0)
+
+    dt = t[1] - t[0] if n > 1 else 0.0
+    if table and n > 1 and len(amps) * sps < n and _phase_aligned(freqs, sps * dt):
+        j = t[0] + np.arange(sps) * dt
+        rows = amps[:, None] * np.sin(2 * pi * freqs[:, None] * j + phases[:, None])
+        n_sym = -(-n // sps)
+        return np.take(rows, symbols[:n_sym], axis=0).reshape(-1)[:n]
+
+    s = symbols[symbol_index(n, sps)]
+    return amps[s] * np.sin(2 * pi * freqs[s] * t + phases[s])
+
+
+def ask(bits, t, A, fc, sps, table=True):
+    """On-off keying: bit 1 -> carrier of amplitude A, bit 0 -> silence."""
+    return keyed_carrier(t, sps, bits, [0.0, A], fc, 0.0, table)
+
+
+def bpsk(bits, t, A, fc, sps, table=True):
+    """Bit 0 -> phase 0, bit 1 -> phase pi."""
+    return keyed_carrier(t, sps, bits, A, fc, [0.0, pi], table)
+
+
+def qpsk(bits, t, A, fc, sps, table=True):
+    """Two bits per symbol, each symbol spans two bit periods."""
+    if len(bits) % 2 != 0:
+        bits = np.append(bits, np.uint8(0))
+    symbols = bits[0::2] * 2 + bits[1::2]
+    return keyed_carrier(t, 2 * sps, symbols, A, fc, QPSK_PHASES, table)
+
+
+def fsk(bits, t, A, fc, sps, f_delta, table=True):
+    """Bit 0 -> fc - f_delta/2, bit 1 -> fc + f_delta/2."""
+    return keyed_carrier(t, sps, bits, A, [fc - f_delta / 2, fc + f_delta / 2], 0.0, table)
+
+
+def dpsk(bits, t, A, fc, sps, table=True, initial_state=0):
+    """Bit 1 toggles the carrier phase by pi, bit 0 keeps it.
+
+    `initial_state` is the phase state (0 or 1, i.e. 0 or pi) before the
+    first bit, for continuing a stream across blocks.
+    """
+    states = differential.diff_encode("DPSK", bits, initial_state)
+    return keyed_carrier(t, sps, states, A, fc, differential.symbol_phases("DPSK"), table)
+
+
+def dqpsk(bits, t, A, fc, sps, table=True, initial_state=0):
+    """Each Gray-coded dibit advances the carrier phase by 0, pi/2, pi or 3 pi/2.
+
+    Symbols span two bit periods; `initial_state` is the quarter-turn phase
+    state before the first symbol.
+    """
+    states = differential.diff_encode("DQPSK", bits, initial_state)
+    return keyed_carrier(t, 2 * sps, states, A, fc, differential.symbol_phases("DQPSK"), table)
+
+
+def mary(mod_type, bits, t, A, fc, sps, table=True):
+    """M-PSK / M-QAM: log2(M) bits per symbol, each symbol spans that many bit periods.
+
+    A unit-energy point `c` is sent as `A |c| sin(2 pi fc t + arg c)`.
+    """
+    k = constellation.bits_per_symbol(mod_type)
+    points = constellation.constellation_table(mod_type)
+    symbols = constellation.pack_symbols(bits, k)
+    return keyed_carrier(t, k * sps, symbols, A * np.abs(points), fc, np.angle(points), table)
+
+
+MODULATORS = {
+    "ASK": ask,
+    "BPSK": bpsk,
+    "QPSK": qpsk,
+    "FSK": fsk,
+    "DPSK": dpsk,
+    "DQPSK": dqpsk,
+    "CPFSK": cpfsk,
+    "MSK": msk,
+    "GMSK": gmsk,
+}
+MARY_TYPES = tuple(f"{M}PSK" for M in constellation.PSK_ORDERS) + tuple(
+    f"{M}QAM" for M in constellation.QAM_ORDERS)
+for _name in MARY_TYPES:
+    MODULATORS[_name] = partial(mary, _name)
+
+MOD_TYPES = tuple(MODULATORS)
+
+# Schemes parameterized by the tone separation f_delta
+NEEDS_F_DELTA = ("FSK", "CPFSK")
+
+# Schemes whose waveform is a train of complex symbols times a pulse, and so
+# can be pulse shaped
+LINEAR_TYPES = ("ASK", "BPSK", "QPSK", "DPSK", "DQPSK") + MARY_TYPES
+
+
+def symbol_bits(mod_type):
+    """Bits carried by one symbol (each bit lasts one bit period Tb)."""
+    if mod_type in ("QPSK", "DQPSK"):
+        return 2
+    if constellation.is_mary(mod_type):
+        return constellation.bits_per_symbol(mod_type)
+    return 1
+
+
+def whole_symbol_bits(mod_type, n_bits):
+    """`n_bits` rounded up to whole symbols: the bit periods a modulated signal spans.
+
+    A trailing partial symbol is sent in full with its missing bits set to 0,
+    so the receiver integrates a complete symbol.
+    """
+    k = symbol_bits(mod_type)
+    return -(-n_bits // k) * k
+
+
+def iq_symbols(mod_type, bits, A, initial_state=0):
+    """Complex symbols for a bit array. QPSK and M-ary pack several bits per symbol.
+
+    FSK has no constant symbol value; its symbols are the tone signs +-1.
+    """
+    bits = np.asarray(bits, dtype=np.uint8)
+    if mod_type == "ASK":
+        return A * bits.astype(complex)
+    if mod_type == "BPSK":
+        return A * (1 - 2 * bits.astype(float)) + 0j
+    if mod_type == "QPSK":
+        if len(bits) % 2 != 0:
+            bits = np.append(bits, np.uint8(0))
+        return A * np.exp(1j * QPSK_PHASES[bits[0::2] * 2 + bits[1::2]])
+    if mod_type == "FSK":
+        return 2 * bits.astype(float) - 1 + 0j
+    if differential.is_differential(mod_type):
+        states = differential.diff_encode(mod_type, bits, initial_state)
+        return A * np.exp(1j * differential.symbol_phases(mod_type)[states])
+    if constellation.is_mary(mod_type):
+        return A * constellation.map_bits(mod_type, bits)
+    raise ValueError(f"Unknown modulation type: {mod_type}")
+
+
+def ideal_points(mod_type):
+    """Symbol alphabet of a linear scheme at unit amplitude (what `iq_symbols` emits for A = 1)."""
+    if mod_type not in LINEAR_TYPES:
+        raise ValueError(f"{mod_type} has no symbol constellation")
+    if differential.is_differential(mod_type):
+        return np.exp(1j * differential.symbol_phases(mod_type))
+    k = symbol_bits(mod_type)
+    return iq_symbols(mod_type, constellation.unpack_symbols(np.arange(2 ** k), k), 1.0)
+
+
+def shaped_envelope(mod_type, bits, A, sps, pulse, initial_state=0):
+    """Pulse-shaped complex envelope at `sps` samples per bit (whole symbols)."""
+    if mod_type not in LINEAR_TYPES:
+        raise ValueError(f"{mod_type} does not support pulse shaping")
+    symbols = iq_symbols(mod_type, bits, A, initial_state)
+    return shape_symbols(symbols, symbol_bits(mod_type) * sps, pulse)
+
+
+def average_power(mod_type, A):
+    """Nominal mean power of a long random stream (equiprobable bits).
+
+    M-ary constellations have unit average energy, like the PSK schemes, and
+    the continuous-phase schemes have a constant envelope.
+    """
+    if mod_type not in MODULATORS:
+        raise ValueError(f"Unknown modulation type: {mod_type}")
+    # Half the bits of an ASK stream are silent
+    return A ** 2 / 4 if mod_type == "ASK" else A ** 2 / 2
+
+
+def modulate(mod_type, bits, bit_rate, A, fc, fs, f_delta=None, table=True, pulse=None):
+    """Modulate a 0/1 bit array. Returns `(t, signal)`, spanning whole symbols.
+
+    `table` enables the per-symbol carrier lookup table (see `keyed_carrier`);
+    `pulse` (a `pulses.PulseShape`) replaces the rectangular pulses of the
+    linear schemes.
+    """
+    if mod_type not in MODULATORS:
+        raise ValueError(f"Unknown modulation type: {mod_type}")
+    if mod_type in NEEDS_F_DELTA and f_delta is None:
+        raise ValueError(f"{mod_type} requires f_delta")
+
+    bits = np.asarray(bits, dtype=np.uint8)
+    fs = int(fs)
+    t = time_axis(whole_symbol_bits(mod_type, len(bits)), bit_rate, fs)
+    if is_shaped(pulse):
+        x = shaped_envelope(mod_type, bits, A, fs, pulse)[:len(t)]
+        signal = np.imag(x * np.exp(2j * pi * fc * t))
+    elif mod_type in NEEDS_F_DELTA:
+        signal = MODULATORS[mod_type](bits, t, A, fc, fs, f_delta, table=table)
+    else:
+        signal = MODULATORS[mod_type](bits, t, A, fc, fs, table=table)
+    return t, signal
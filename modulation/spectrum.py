@@ -0,0 +1,152 @@
+"""Power spectral density estimates (Welch's method) and spectrograms.
+
+The signal is cut into overlapping segments as a strided view
+(`sliding_window_view`, no copy), and each batch of segments is windowed and
+transformed by a single 2-D FFT call. Welch's method keeps only the running
+sum of |X|^2, so memory depends on the batch size and not on the signal
+length; a spectrogram keeps every segment's spectrum as one row, and
+`Spectrogram` computes the rows block by block as a stream arrives.
+Window arrays are cached by (name, length).
+"""
+
+from functools import lru_cache
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+WINDOWS = ("hann", "hamming", "blackman", "rect")
+DEFAULT_NPERSEG = 4096
+DEFAULT_FRAME = 256  # spectrogram frame length
+WELCH_BATCH = 256  # segments per FFT call
+
+
+@lru_cache(maxsize=32)
+def window_array(name, n):
+    """Periodic analysis window of length `n` (read-only)."""
+    if name == "hann":
+        w = np.hanning(n + 1)[:n]
+    elif name == "hamming":
+        w = np.hamming(n + 1)[:n]
+    elif name == "blackman":
+        w = np.blackman(n + 1)[:n]
+    elif name == "rect":
+        w = np.ones(n)
+    else:
+        raise ValueError(f"Unknown window: {name}")
+    w.setflags(write=False)
+    return w
+
+
+def welch_psd(x, sample_rate, nperseg=DEFAULT_NPERSEG, overlap=0.5, window="hann",
+              batch=WELCH_BATCH):
+    """Welch PSD of `x` sampled at `sample_rate` Hz. Returns `(f, psd)` in units^2/Hz.
+
+    Real input gives the one-sided spectrum on `[0, sample_rate / 2]`; complex
+    input (an envelope) gives the two-sided spectrum centred on 0 Hz.
+    Segments are `nperseg` samples (capped at `len(x)`) with fractional
+    `overlap`.
+    """
+    x = np.asarray(x)
+    nperseg = max(1, min(int(nperseg), len(x)))
+    step = max(1, int(round(nperseg * (1 - overlap))))
+    w = window_array(window, nperseg)
+    segments = sliding_window_view(x, nperseg)[::step]
+    is_complex = np.iscomplexobj(x)
+    fft = np.fft.fft if is_complex else np.fft.rfft
+
+    power = np.zeros(nperseg if is_complex else nperseg // 2 + 1)
+    for start in range(0, len(segments), batch):
+        X = fft(segments[start:start + batch] * w, axis=1)
+        power += (X.real ** 2 + X.imag ** 2).sum(axis=0)
+    psd = power / (len(segments) * sample_rate * np.dot(w, w))
+
+    if is_complex:
+        f = np.fft.fftshift(np.fft.fftfreq(nperseg, 1 / sample_rate))
+        return f, np.fft.fftshift(psd)
+    # Fold the negative frequencies onto the positive ones (not DC or Nyquist)
+    psd[1:nperseg - nperseg // 2] *= 2
+    return np.fft.rfftfreq(nperseg, 1 / sample_rate), psd
+
+
+def envelope_to_passband(f, psd, fc):
+    """One-sided passband PSD of `Im{x e^(j 2 pi fc t)}` from the two-sided PSD of `x`.
+
+    Valid while the envelope bandwidth is below `fc` (the negative-frequency
+    image does not fold back over 0 Hz).
+    """
+    f = f + fc
+    keep = f >= 0
+    return f[keep], psd[..., keep] / 2
+
+
+def occupied_bandwidth(f, psd, fraction=0.99):
+    """Width of the band holding `fraction` of the power, leaving equal tails either side."""
+    power = np.cumsum(psd)
+    if power[-1] <= 0:
+        return 0.0
+    lo, hi = np.interp([(1 - fraction) / 2, (1 + fraction) / 2], power / power[-1], f)
+    return float(hi - lo)
+
+
+class Spectrogram:
+    """Short-time PSD of a stream, one row per frame.
+
+    Frames of `nperseg` samples start every `step` samples (fractional
+    `overlap`, as in `welch_psd`) and are scaled the same way, so each row is
+    a one-frame PSD. `process` returns the frames completed by each new block;
+    the samples of unfinished frames are carried over, so feeding a signal in
+    blocks gives exactly the frames of the whole signal. Real input gives
+    one-sided rows (`np.fft.rfft`), complex input two-sided rows centred on 0
+    Hz. `f` is set once the first block has been seen.
+    """
+
+    def __init__(self, sample_rate, nperseg=DEFAULT_FRAME, overlap=0.5, window="hann",
+                 batch=WELCH_BATCH, t0=0.0):
+        self.sample_rate = sample_rate
+        self.nperseg = max(1, int(nperseg))
+        self.step = max(1, int(round(self.nperseg * (1 - overlap))))
+        self.window, self.batch = window, batch
+        self.f = None
+        self._tail = None
+        self._start = 0  # sample index of the tail's first sample
+        self._t0 = t0
+
+    def process(self, x):
+        """Spectra of the frames completed by `x`. Returns `(t, rows)`, `t` at frame centres."""
+        x = np.asarray(x)
+        buf = x if self._tail is None else np.concatenate([self._tail, x])
+        is_complex = np.iscomplexobj(buf)
+        n_bins = self.nperseg if is_complex else self.nperseg // 2 + 1
+        if self.f is None:
+            f = np.fft.fftfreq(self.nperseg, 1 / self.sample_rate)
+            self.f = np.fft.fftshift(f) if is_complex else np.fft.rfftfreq(self.nperseg, 1 / self.sample_rate)
+        n_frames = (len(buf) - self.nperseg) // self.step + 1 if len(buf) >= self.nperseg else 0
+
+        rows = np.empty((n_frames, n_bins))
+        if n_frames:
+            w = window_array(self.window, self.nperseg)
+            frames = sliding_window_view(buf, self.nperseg)[::self.step][:n_frames]
+            fft = np.fft.fft if is_complex else np.fft.rfft
+            for start in range(0, n_frames, self.batch):
+                X = fft(frames[start:start + self.batch] * w, axis=1)
+                rows[start:start + self.batch] = X.real ** 2 + X.imag ** 2
+            rows /= self.sample_rate * np.dot(w, w)
+            if is_complex:
+                rows = np.fft.fftshift(rows, axes=1)
+            else:
+                rows[:, 1:self.nperseg - self.nperseg // 2] *= 2
+
+        starts = self._start + np.arange(n_frames) * self.step
+        t = self._t0 + (starts + self.nperseg / 2) / self.sample_rate
+        consumed = n_frames * self.step
+        self._tail = buf[consumed:].copy()
+        self._start += consumed
+        return t, rows
+
+
+def spectrogram(x, sample_rate, nperseg=DEFAULT_FRAME, overlap=0.5, window="hann",
+                batch=WELCH_BATCH, t0=0.0):
+    """Spectrogram of a whole signal. Returns `(t, f, rows)` with `rows[frame, frequency]`."""
+    spec = Spectrogram(sample_rate, nperseg, overlap, window, batch, t0)
+    t, rows = spec.process(x)
+    return t, spec.f, rows
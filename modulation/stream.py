@@ -0,0 +1,261 @@
+"""Streaming, block-wise modulation pipeline.
+
+A pipeline is a chain of generators: a bit source yields uint8 bit blocks,
+`modulate_stream` turns them into `(t, signal)` blocks, `awgn_stream` adds
+noise to give `(t, signal, rx)` blocks, and a sink consumes them. Only one
+block is alive at a time, so peak memory depends on the block size and not
+on the stream length. State that spans block edges (time offset, the DPSK/DQPSK
+phase state, leftover bits of a multi-bit symbol, the continuous carrier phase
+of CPFSK/MSK/GMSK, the pulse-shaping filter history) is carried by
+`StreamModulator`; `demodulate_stream`
+carries the differential detector's last symbol the other way.
+"""
+
+import numpy as np
+from numpy import pi
+
+from .channel import awgn, seed_sequence
+from .cpm import PhaseAccumulator, is_cpm, modulation_index
+from .demod import demodulate, symbol_iq
+from .differential import DifferentialDetector, final_state, is_differential
+from .pulses import PulseShaper, is_shaped
+from .schemes import (
+    LINEAR_TYPES,
+    MODULATORS,
+    NEEDS_F_DELTA,
+    average_power,
+    fsk,
+    iq_symbols,
+    symbol_bits,
+)
+from .spectrum import DEFAULT_FRAME, Spectrogram
+
+DEFAULT_BLOCK_BITS = 4096
+
+
+# ---- SOURCES ----
+def array_source(bits, block_bits=DEFAULT_BLOCK_BITS):
+    """Yield an in-memory bit array in blocks of `block_bits`."""
+    bits = np.asarray(bits, dtype=np.uint8)
+    for start in range(0, len(bits), block_bits):
+        yield bits[start:start + block_bits]
+
+
+def random_source(n_bits, block_bits=DEFAULT_BLOCK_BITS, seed=None):
+    """Yield `n_bits` equiprobable random bits in blocks."""
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_bits, block_bits):
+        yield rng.integers(0, 2, min(block_bits, n_bits - start), dtype=np.uint8)
+
+
+def file_source(fobj, block_bits=DEFAULT_BLOCK_BITS):
+    """Yield the bits of a binary file object (MSB first) without reading it whole."""
+    block_bytes = max(1, block_bits // 8)
+    while True:
+        data = fobj.read(block_bytes)
+        if not data:
+            return
+        yield np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+
+
+# ---- MODULATOR ----
+class StreamModulator:
+    """Modulate consecutive bit blocks as one continuous stream.
+
+    Blocks may have any length; multi-bit symbols (QPSK, M-ary) hold back
+    trailing bits that do not fill a symbol until the next block (or pad them
+    with 0 on `flush`). Continuous-phase schemes integrate their phase with a
+    `cpm.PhaseAccumulator`; GMSK's filter delay means its blocks lag the bits
+    slightly and the last samples come out of `flush`. Pulse-shaped streams
+    lag the same way through a `pulses.PulseShaper`.
+    """
+
+    def __init__(self, mod_type, bit_rate, A, fc, fs, f_delta=None, table=True, pulse=None):
+        if mod_type not in MODULATORS:
+            raise ValueError(f"Unknown modulation type: {mod_type}")
+        if mod_type in NEEDS_F_DELTA and f_delta is None:
+            raise ValueError(f"{mod_type} requires f_delta")
+        if is_shaped(pulse) and mod_type not in LINEAR_TYPES:
+            raise ValueError(f"{mod_type} does not support pulse shaping")
+        self.mod_type = mod_type
+        self.A, self.fc, self.f_delta, self.table = A, fc, f_delta, table
+        self.fs = int(fs)
+        self.dt = 1 / (bit_rate * self.fs)
+        self.sample_offset = 0
+        self.diff_state = 0
+        self._pending = np.zeros(0, dtype=np.uint8)
+        self._phase = None
+        self._shaper = None
+        self._n_bits = 0
+        if is_shaped(pulse):
+            self._shaper = PulseShaper(symbol_bits(mod_type) * self.fs, pulse)
+        if is_cpm(mod_type):
+            h = modulation_index(mod_type, bit_rate, f_delta)
+            self._phase = PhaseAccumulator(mod_type, self.fs, h)
+
+    def process(self, bits):
+        """Modulate the next block. Returns `(t, signal)`."""
+        bits = np.asarray(bits, dtype=np.uint8)
+        k = symbol_bits(self.mod_type)
+        if k > 1:
+            bits = np.concatenate([self._pending, bits])
+            n_whole = len(bits) - len(bits) % k
+            bits, self._pending = bits[:n_whole], bits[n_whole:]
+        return self._emit(bits)
+
+    def flush(self):
+        """Emit whatever is held back at the end of the stream."""
+        if self._phase is not None:
+            phase = self._phase.flush()
+            return self._emit_phase(phase) if len(phase) else None
+        parts = []
+        if len(self._pending):
+            # Send the partial final symbol in full, as `schemes.modulate` does
+            k = symbol_bits(self.mod_type)
+            bits = np.zeros(-(-len(self._pending) // k) * k, dtype=np.uint8)
+            bits[:len(self._pending)] = self._pending
+            self._pending = np.zeros(0, dtype=np.uint8)
+            parts.append(self._emit(bits))
+        if self._shaper is not None:
+            parts.append(self._emit_envelope(self._shaper.flush()))
+        parts = [p for p in parts if len(p[0])]
+        if not parts:
+            return None
+        return tuple(np.concatenate(arrays) for arrays in zip(*parts))
+
+    def _time(self, n):
+        t = (self.sample_offset + np.arange(n)) * self.dt
+        self.sample_offset += n
+        return t
+
+    def _emit_phase(self, phase):
+        t = self._time(len(phase))
+        return t, self.A * np.sin(2 * pi * self.fc * t + phase)
+
+    def _emit_envelope(self, x):
+        # Only the symbols sent so far; the rest of the filter tail is dropped
+        x = x[:self._n_bits * self.fs - self.sample_offset]
+        t = self._time(len(x))
+        return t, np.imag(x * np.exp(2j * pi * self.fc * t))
+
+    def _emit(self, bits):
+        self._n_bits += len(bits)
+        if self._phase is not None:
+            return self._emit_phase(self._phase.process(bits))
+        if self._shaper is not None:
+            symbols = iq_symbols(self.mod_type, bits, self.A, self.diff_state)
+            if is_differential(self.mod_type):
+                self.diff_state = final_state(self.mod_type, bits, self.diff_state)
+            return self._emit_envelope(self._shaper.process(symbols))
+        t = self._time(len(bits) * self.fs)
+
+        if self.mod_type == "FSK":
+            signal = fsk(bits, t, self.A, self.fc, self.fs, self.f_delta, table=self.table)
+        elif is_differential(self.mod_type):
+            signal = MODULATORS[self.mod_type](bits, t, self.A, self.fc, self.fs, table=self.table,
+                                               initial_state=self.diff_state)
+            self.diff_state = final_state(self.mod_type, bits, self.diff_state)
+        else:
+            signal = MODULATORS[self.mod_type](bits, t, self.A, self.fc, self.fs, table=self.table)
+        return t, signal
+
+
+def modulate_stream(blocks, mod_type, bit_rate, A, fc, fs, f_delta=None, table=True, pulse=None):
+    """Generator stage: bit blocks -> `(t, signal)` blocks."""
+    modulator = StreamModulator(mod_type, bit_rate, A, fc, fs, f_delta, table, pulse)
+    for bits in blocks:
+        if len(bits):
+            t, signal = modulator.process(bits)
+            if len(t):
+                yield t, signal
+    tail = modulator.flush()
+    if tail is not None:
+        yield tail
+
+
+# ---- CHANNEL ----
+def awgn_stream(blocks, snr_db, signal_power, seed=None):
+    """Generator stage: `(t, signal)` -> `(t, signal, rx)` with AWGN.
+
+    The noise level is fixed up front from `signal_power` (see
+    `schemes.average_power`), since a stream's mean power is not known until
+    it ends. Noise is indexed by sample position, so for a given seed it is
+    identical to `awgn` on the whole signal whatever the block size.
+    """
+    seed = seed_sequence(seed)
+    offset = 0
+    for t, signal in blocks:
+        yield t, signal, awgn(signal, snr_db, seed, offset, signal_power)
+        offset += len(signal)
+
+
+def simulate_stream(bits_blocks, mod_type, bit_rate, A, fc, fs, snr_db, f_delta=None,
+                    seed=None, table=True, pulse=None):
+    """Source -> modulator -> channel, yielding `(t, signal, rx)` blocks."""
+    modulated = modulate_stream(bits_blocks, mod_type, bit_rate, A, fc, fs, f_delta, table, pulse)
+    return awgn_stream(modulated, snr_db, average_power(mod_type, A), seed)
+
+
+# ---- RECEIVER ----
+def demodulate_stream(blocks, mod_type, A, fc, fs, f_delta=None, pulse=None):
+    """Generator stage: `(t, signal, rx)` blocks -> received bit blocks.
+
+    Blocks must hold whole symbols, as `modulate_stream` emits them.
+    DPSK/DQPSK compare each block's first symbol with the previous block's
+    last one. The continuous-phase schemes and shaped pulses (`pulse`, as
+    given to `modulate_stream`) are not supported, since their filters reach
+    across block edges.
+    """
+    if is_cpm(mod_type):
+        raise ValueError(f"{mod_type} cannot be demodulated block by block")
+    if is_shaped(pulse):
+        raise ValueError("Pulse-shaped streams cannot be demodulated block by block")
+    detector = DifferentialDetector(mod_type) if is_differential(mod_type) else None
+    sym_len = symbol_bits(mod_type) * int(fs)
+    for t, _, rx in blocks:
+        if detector is not None:
+            yield detector.process(symbol_iq(rx, t, sym_len, fc))
+        else:
+            yield demodulate(mod_type, rx, t, A, fc, fs, f_delta)
+
+
+def spectrogram_stream(blocks, sample_rate, nperseg=DEFAULT_FRAME, overlap=0.5, window="hann"):
+    """Generator stage: `(t, signal, rx)` blocks -> `(t_frames, rows)` spectrogram rows of rx.
+
+    Rows come out as soon as a block completes their frames (see
+    `spectrum.Spectrogram`), so a waterfall can grow with the stream.
+    """
+    spec = None
+    for t, _, rx in blocks:
+        if spec is None:
+            spec = Spectrogram(sample_rate, nperseg, overlap, window, t0=t[0] if len(t) else 0.0)
+        t_frames, rows = spec.process(rx)
+        if len(t_frames):
+            yield t_frames, rows
+
+
+# ---- SINKS ----
+def collect(blocks):
+    """Concatenate every block of a stream (only for streams that fit in memory)."""
+    parts = list(zip(*blocks))
+    return tuple(np.concatenate(p) for p in parts)
+
+
+def stream_stats(blocks):
+    """Running totals over a `(t, signal, rx)` stream without keeping samples."""
+    n = 0
+    energy = 0.0
+    noise_energy = 0.0
+    peak = 0.0
+    for _, signal, rx in blocks:
+        n += len(signal)
+        energy += float(np.dot(signal, signal))
+        noise = rx - signal
+        noise_energy += float(np.dot(noise, noise))
+        peak = max(peak, float(np.max(np.abs(signal), initial=0.0)))
+    return {
+        "samples": n,
+        "signal_power": energy / n if n else 0.0,
+        "noise_power": noise_energy / n if n else 0.0,
+        "peak": peak,
+    }
@@ -0,0 +1,148 @@
+"""Parameter sweeps: BER, occupied bandwidth and PAPR over a grid of the
+waveform parameters.
+
+`parameter_sweep` covers the Cartesian grid snr_db x fc x fs x bit_rate x A
+without simulating every cell:
+
+- A: every metric is invariant to the amplitude (the noise is set relative
+  to the signal power and the decision rules scale with A), so the metrics
+  are computed at A = 1 and broadcast along the A axis.
+- snr_db: bandwidth and PAPR depend on the clean signal only. For the BER a
+  column's clean signal and one unit-noise stream are broadcast against the
+  noise levels into a (snr, samples) array, at most SWEEP_BATCH_SAMPLES
+  samples at a time.
+- fc, fs and bit_rate change the waveform itself, so each combination (a
+  "column") is a separate task; columns run on a `ProcessPoolExecutor` as in
+  `ber`.
+
+With a `diskcache.DiskCache`, every (column, snr) cell is stored under a
+hash of its parameters, so extending the grid only simulates the new cells.
+"""
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from .channel import noise_sigma, seed_sequence, standard_noise
+from .demod import demodulate
+from .diskcache import cache_key
+from .schemes import MODULATORS, NEEDS_F_DELTA, modulate
+from .spectrum import occupied_bandwidth, welch_psd
+
+SWEEP_PARAMS = ("snr_db", "fc", "fs", "bit_rate", "A")
+SWEEP_METRICS = ("ber", "bandwidth", "papr_db")
+SWEEP_BATCH_SAMPLES = 1 << 22  # noisy samples held at once per column
+
+
+def papr_db(signal):
+    """Peak-to-average power ratio of a real signal, in dB."""
+    power = np.mean(signal ** 2)
+    return float(10 * np.log10(np.max(signal ** 2) / power)) if power > 0 else float("nan")
+
+
+def sweep_column(mod_type, bits, fc, fs, bit_rate, snr_db, noise_seed, f_delta=None, pulse=None):
+    """Metrics of one (fc, fs, bit_rate) column at each SNR in `snr_db`.
+
+    Returns an array of shape `(len(snr_db), len(SWEEP_METRICS))`.
+    """
+    bits = np.asarray(bits, dtype=np.uint8)
+    snr_db = np.atleast_1d(np.asarray(snr_db, dtype=float))
+    t, signal = modulate(mod_type, bits, bit_rate, 1.0, fc, fs, f_delta, pulse=pulse)
+    out = np.empty((len(snr_db), len(SWEEP_METRICS)))
+    out[:, 1] = occupied_bandwidth(*welch_psd(signal, bit_rate * fs))
+    out[:, 2] = papr_db(signal)
+
+    noise = standard_noise(noise_seed, 0, len(signal))
+    sigma = noise_sigma(np.mean(signal ** 2), snr_db)
+    rows = max(1, SWEEP_BATCH_SAMPLES // max(len(signal), 1))
+    for start in range(0, len(snr_db), rows):
+        rx = signal + sigma[start:start + rows, None] * noise
+        for k, r in enumerate(rx, start):
+            decided = demodulate(mod_type, r, t, 1.0, fc, fs, f_delta, pulse)[:len(bits)]
+            out[k, 0] = np.count_nonzero(decided != bits) / len(bits)
+    return out
+
+
+def _run_column(task):
+    return sweep_column(*task)
+
+
+def parameter_sweep(mod_type, grid, n_bits, seed=0, f_delta=None, pulse=None, workers=1,
+                    cache=None, progress=None):
+    """Metrics over the Cartesian product of `grid`, a dict of SWEEP_PARAMS -> values.
+
+    The same `n_bits` random bits and noise stream (both drawn from `seed`)
+    are used in every cell. `workers` and `progress` work as in
+    `ber.ber_sweep`, with one task per column that has uncached cells.
+    `cache` is an optional `diskcache.DiskCache`. Returns a dict with the grid
+    axes, one array per metric of shape `(len(grid[p]) for p in
+    SWEEP_PARAMS)`, and the number of `simulated` and `cached` cells (cells
+    along A not counted).
+    """
+    if mod_type not in MODULATORS:
+        raise ValueError(f"Unknown modulation type: {mod_type}")
+    if mod_type in NEEDS_F_DELTA and f_delta is None:
+        raise ValueError(f"{mod_type} requires f_delta")
+    missing = set(SWEEP_PARAMS) - set(grid)
+    if missing:
+        raise ValueError(f"Sweep grid lacks {sorted(missing)}")
+    axes = {p: np.atleast_1d(np.asarray(grid[p], dtype=float)) for p in SWEEP_PARAMS}
+    axes["fs"] = axes["fs"].astype(np.int64)
+    snrs = axes["snr_db"]
+    if seed is None:
+        cache = None  # fresh entropy: results are not reproducible, so not cacheable
+
+    bit_seed, noise_seed = seed_sequence(seed).spawn(2)
+    bits = np.random.default_rng(bit_seed).integers(0, 2, n_bits, dtype=np.uint8)
+    shape = tuple(len(axes[p]) for p in SWEEP_PARAMS)
+    values = np.full(shape[:-1] + (len(SWEEP_METRICS),), np.nan)
+
+    def key(fc, fs, bit_rate, snr_db):
+        return cache_key(mod_type=mod_type, n_bits=int(n_bits), seed=seed, f_delta=f_delta,
+                         pulse=pulse, fc=float(fc), fs=int(fs), bit_rate=float(bit_rate),
+                         snr_db=float(snr_db))
+
+    tasks = {}
+    n_cached = 0
+    for idx in itertools.product(*(range(n) for n in shape[1:4])):
+        fc, fs, bit_rate = (axes[p][i] for p, i in zip(("fc", "fs", "bit_rate"), idx))
+        todo = []
+        for s, snr_db in enumerate(snrs):
+            hit = cache.get(key(fc, fs, bit_rate, snr_db)) if cache is not None else None
+            if hit is None:
+                todo.append(s)
+            else:
+                values[(s,) + idx] = hit
+                n_cached += 1
+        if todo:
+            tasks[idx] = (todo, (mod_type, bits, float(fc), int(fs), float(bit_rate), snrs[todo],
+                                 noise_seed, f_delta, pulse))
+
+    def store(idx, result):
+        todo, task = tasks[idx]
+        values[(todo,) + idx] = result
+        if cache is not None:
+            for s, row in zip(todo, result):
+                cache.put(key(*task[2:5], snrs[s]), row)
+        done.append(idx)
+        if progress is not None:
+            progress(len(done) / len(tasks))
+
+    done = []
+    n_workers = 1 if workers == 1 else (workers or os.cpu_count() or 1)
+    if n_workers == 1 or len(tasks) <= 1:
+        for idx, (_, task) in tasks.items():
+            store(idx, _run_column(task))
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_workers, len(tasks))) as pool:
+            futures = {pool.submit(_run_column, task): idx for idx, (_, task) in tasks.items()}
+            for future in as_completed(futures):
+                store(futures[future], future.result())
+
+    result = {"axes": axes, "simulated": sum(len(todo) for todo, _ in tasks.values()),
+              "cached": n_cached}
+    for m, name in enumerate(SWEEP_METRICS):
+        result[name] = np.broadcast_to(values[..., m, None], shape)
+    return result